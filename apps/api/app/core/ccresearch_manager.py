@@ -18,16 +18,24 @@ Key Features:
 import asyncio
 import os
 import re
+import fcntl
+import fnmatch
+import inspect
 import time
 import uuid
 import shutil
+import string
+import subprocess
 import json
 import logging
 import resource
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, Callable, Any, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from contextlib import asynccontextmanager
 from collections import deque
 
 try:
@@ -35,10 +43,29 @@ try:
 except ImportError:
     pexpect = None  # Will be caught at runtime
 
+# Project metadata and merged settings are (de)serialized with orjson when
+# available (C encoder, bytes in/out), stdlib otherwise.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from app.core.config import settings
 from app.core.session_manager import session_manager, get_user_id_from_email
 
 
+def _dump_json_bytes(data: Any) -> bytes:
+    """Serialize data as indented JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _load_json_bytes(raw: bytes) -> Any:
+    """Parse JSON bytes."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
 def _validate_session_id(session_id: str) -> bool:
     """Validate that session_id is a proper UUID v4 to prevent injection attacks."""
     try:
@@ -48,11 +75,18 @@ def _validate_session_id(session_id: str) -> bool:
         return False
 
 
+@lru_cache(maxsize=256)
+def _resolve_workspace_root(workspace: Path) -> Path:
+    """Resolved form of a workspace root (our own directories, so safe to cache)."""
+    return workspace.resolve()
+
+
 def validate_path_in_workspace(workspace: Path, target: Path) -> Path:
     """Validate that target path is within workspace, preventing path traversal.
 
     Uses pathlib.relative_to() which raises ValueError on traversal,
-    and rejects symlinks pointing outside workspace.
+    and rejects symlinks pointing outside workspace. The workspace root is
+    resolved once and cached; only target is resolved per call.
 
     Args:
         workspace: The workspace root directory
@@ -64,27 +98,25 @@ def validate_path_in_workspace(workspace: Path, target: Path) -> Path:
     Raises:
         ValueError: If path traversal is detected or symlink points outside workspace
     """
-    workspace_real = workspace.resolve()
+    workspace_real = _resolve_workspace_root(workspace)
     target_real = target.resolve()
-    # This raises ValueError if target_real is not relative to workspace_real
+    # This raises ValueError if target_real is not relative to workspace_real.
+    # target_real has every symlink (target itself included) resolved, so a
+    # symlink pointing outside the workspace is rejected here as well
     target_real.relative_to(workspace_real)
-    # Reject symlinks that point outside workspace
-    if target.is_symlink():
-        link_target = target.resolve()
-        try:
-            link_target.relative_to(workspace_real)
-        except ValueError:
-            raise ValueError("Symlink points outside workspace")
     return target_real
 
 
 # Resource limits for CCResearch sessions (from centralized config)
 # These limits protect the host from OOM crashes during heavy research tasks
-# Note: RLIMIT_AS (virtual memory) must be high because Node.js reserves large
-# virtual address space even when not using physical memory.
+# Note: memory is capped with RLIMIT_DATA (allocated heap/anonymous memory),
+# not RLIMIT_AS, because Node.js reserves large virtual address space it never uses.
 MEMORY_LIMIT_MB = settings.CCRESEARCH_MEMORY_LIMIT_MB
-MAX_PROCESSES = settings.CCRESEARCH_MAX_PROCESSES
 MAX_OPEN_FILES = settings.CCRESEARCH_MAX_OPEN_FILES
+NOFILE_SOFT_LIMIT = 1024  # Soft fd limit (usual Linux default); processes may raise it to MAX_OPEN_FILES
+
+# Max bytes taken from a session's PTY per read-loop iteration
+PTY_READ_SIZE = 64 * 1024
 
 # ============================================================================
 # AUTOMATION RULES - Auto-respond to specific terminal prompts
@@ -110,37 +142,46 @@ def _set_resource_limits():
     """
     Set resource limits for spawned CCResearch processes.
 
-    This function is called via preexec_fn before the process is spawned,
-    applying ulimit-style restrictions to prevent any single session from
-    consuming too much memory and crashing the Pi.
+    This function is called via preexec_fn (in the forked child, before exec)
+    by spawn_claude and spawn_shell, applying ulimit-style restrictions to
+    prevent any single session from consuming too much memory and crashing the Pi.
 
     Limits set:
-    - RLIMIT_AS: Virtual memory (address space) limit - set high because
-      Node.js reserves large virtual space even if not using physical RAM
-    - RLIMIT_NPROC: Maximum number of processes
-    - RLIMIT_NOFILE: Maximum open files
-
-    Note: RLIMIT_RSS is not enforced by Linux kernel, so we use RLIMIT_AS.
-    Virtual memory != physical memory - this is a safety cap, not a tight limit.
+    - RLIMIT_DATA: Heap + private anonymous mappings (Linux >= 4.7). Unlike
+      RLIMIT_AS it doesn't count reserved-but-unused address space or
+      file-backed mappings, so Node.js' large virtual reservations don't
+      trip spurious ENOMEM
+    - RLIMIT_NOFILE: Maximum open files (hard). The soft limit is kept at
+      most NOFILE_SOFT_LIMIT: tools that close every possible fd before
+      exec (close_fds without close_range) pay O(soft limit) per spawn,
+      and a process that needs more can raise it up to the hard limit
+    - RLIMIT_CORE: 0 - no multi-GB core dumps when a session crashes
+
+    RLIMIT_NPROC is not set: Linux checks it against every task (threads
+    included) of the user running the server, not against the session, so
+    CCRESEARCH_MAX_PROCESSES there would make Node fail to start threads on a busy host.
+
+    Note: RLIMIT_RSS is not enforced by Linux kernel, so we use RLIMIT_DATA.
     """
     try:
         # Convert MB to bytes
         memory_bytes = MEMORY_LIMIT_MB * 1024 * 1024
 
-        # Set virtual memory limit (address space)
+        # Cap what the process actually allocates (heap/anonymous memory)
         # This prevents runaway memory allocation but allows normal operation
-        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        resource.setrlimit(resource.RLIMIT_DATA, (memory_bytes, memory_bytes))
 
-        # Set max processes (prevent fork bombs from subagents)
-        resource.setrlimit(resource.RLIMIT_NPROC, (MAX_PROCESSES, MAX_PROCESSES))
+        # Set max open files (modest soft limit, see docstring)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(MAX_OPEN_FILES, NOFILE_SOFT_LIMIT), MAX_OPEN_FILES))
 
-        # Set max open files
-        resource.setrlimit(resource.RLIMIT_NOFILE, (MAX_OPEN_FILES, MAX_OPEN_FILES))
+        # No core dumps
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
 
     except Exception as e:
-        # Log but don't fail - limits are protective, not required
-        # Using print since logger may not be set up in preexec context
-        print(f"Warning: Could not set resource limits: {e}")
+        # Log but don't fail - limits are protective, not required.
+        # Raw write to stderr: logging/print locks may be held by another
+        # thread of the parent at fork time
+        os.write(2, f"Warning: Could not set resource limits: {e}\n".encode())
 
 logger = logging.getLogger("ccresearch_manager")
 
@@ -309,6 +350,57 @@ CCRESEARCH_PERMISSIONS_TEMPLATE = {
     "hasClaudeMdExternalIncludesWarningShown": True
 }
 
+# The template never changes at runtime - serialize it once and write the bytes per session
+CCRESEARCH_PERMISSIONS_JSON_BYTES = json.dumps(CCRESEARCH_PERMISSIONS_TEMPLATE, indent=2).encode("utf-8")
+
+# Deny rules compiled once at import: exact rules are a frozenset lookup, the
+# common "Bash(<command>:*)" rules are a frozenset of command names checked
+# against the rule's command head, and the remaining wildcard rules
+# ("Read(~/.ssh/**)", "Bash(nc:-l:*)") are unioned into one regex per tool so a
+# check is at most a single match pass over only the patterns that can apply.
+_DENY_RULES = CCRESEARCH_PERMISSIONS_TEMPLATE["permissions"]["deny"]
+_EXACT_DENY = frozenset(rule for rule in _DENY_RULES if "*" not in rule)
+_BASH_COMMAND_DENY_RE = re.compile(r"Bash\(([^:*()]+):\*\)")
+_DENIED_BASH_COMMANDS = frozenset(
+    m.group(1) for m in map(_BASH_COMMAND_DENY_RE.fullmatch, _DENY_RULES) if m
+)
+_wildcard_by_tool: Dict[str, List[str]] = {}
+for _rule in _DENY_RULES:
+    if "*" in _rule and not _BASH_COMMAND_DENY_RE.fullmatch(_rule):
+        _wildcard_by_tool.setdefault(_rule.split("(", 1)[0], []).append(_rule)
+_WILDCARD_DENY_RES = {
+    tool: re.compile("|".join(f"(?:{fnmatch.translate(rule)})" for rule in rules))
+    for tool, rules in _wildcard_by_tool.items()
+}
+del _wildcard_by_tool, _rule
+
+
+def is_denied(rule: str) -> bool:
+    """Check a permission rule (e.g. "Bash(sudo:apt install)") against the deny list."""
+    if rule in _EXACT_DENY:
+        return True
+    tool, _, arg = rule.partition("(")
+    if tool == "Bash" and rule.endswith(")"):
+        command, sep, _ = arg.partition(":")
+        if sep and command in _DENIED_BASH_COMMANDS:
+            return True
+    pattern = _WILDCARD_DENY_RES.get(tool)
+    return pattern is not None and pattern.match(rule) is not None
+
+
+# Patterns for _clean_log_for_display, compiled once rather than on every log view
+# Matches: ESC[ ... m (SGR), ESC[ ... H (cursor), ESC[ ... J (clear), OSC ... BEL, ESC< / ESC> / ESC=
+_ANSI_ESCAPE_RE = re.compile(r'\x1b\[[0-9;]*[a-zA-Z]|\x1b\][^\x07]*\x07|\x1b[<>=].')
+_OTHER_ESCAPE_RE = re.compile(r'\x1b[^a-zA-Z]*[a-zA-Z]')
+_BARE_ESCAPE_RE = re.compile(r'\x1b.')
+_INPUT_MARKER_RE = re.compile(r'\[INPUT\]\s*')
+# Control chars (keeping \t and \n), box-drawing (2500-257F), block elements
+# (2580-259F) and geometric shapes (25A0-25FF) - terminal UI decoration, not content
+_DECORATIVE_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f\u2500-\u25FF]+')
+_ALNUM_RE = re.compile(r'[a-zA-Z0-9]')
+_EXCESS_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
 # CLAUDE.md template for CCResearch sessions
 # Full access to plugins, skills, and MCP servers
 CLAUDE_MD_TEMPLATE = """# CCResearch Session
@@ -543,6 +635,69 @@ head -20 data/FILENAME  # Replace FILENAME
 ---
 """
 
+def write_file_bytes(path, data: bytes) -> None:
+    """Create/truncate path and write data with raw os.open/os.write (no text layer)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+# CLAUDE_MD_TEMPLATE split once into (literal text, field name) pairs so rendering
+# is a single join instead of re-parsing the format string per session. Everything
+# after the last field is static and kept pre-encoded.
+_CLAUDE_MD_PARTS = tuple(
+    (literal, field_name) for literal, field_name, _, _ in string.Formatter().parse(CLAUDE_MD_TEMPLATE)
+)
+_CLAUDE_MD_SPLIT = max(i for i, (_, field_name) in enumerate(_CLAUDE_MD_PARTS) if field_name is not None) + 1
+_CLAUDE_MD_HEADER_PARTS = _CLAUDE_MD_PARTS[:_CLAUDE_MD_SPLIT]
+_CLAUDE_MD_TAIL_BYTES = "".join(literal for literal, _ in _CLAUDE_MD_PARTS[_CLAUDE_MD_SPLIT:]).encode("utf-8")
+
+
+# UPLOADED_FILES_SECTION has a single {file_list} field and no escaped braces, so it
+# is split around it once and rendered by concatenation
+_UPLOADED_FILES_PREFIX, _UPLOADED_FILES_SUFFIX = UPLOADED_FILES_SECTION.split("{file_list}")
+
+
+def build_uploaded_files_section(uploaded_files: Optional[List[str]]) -> str:
+    """Render the CLAUDE.md section listing uploaded data files ("" if none)."""
+    if not uploaded_files:
+        return ""
+    # Format as markdown table rows
+    file_list = "\n".join(f"| `{f}` | `data/{f}` |" for f in uploaded_files)
+    return _UPLOADED_FILES_PREFIX + file_list + _UPLOADED_FILES_SUFFIX
+
+
+def render_claude_md(
+    session_id: str,
+    email: str,
+    workspace_dir: str,
+    uploaded_files_section: str = ""
+) -> bytes:
+    """Render the session CLAUDE.md as UTF-8 bytes (created_at is stamped now)."""
+    values = {
+        "session_id": session_id,
+        "email": email or "Not provided",
+        "created_at": datetime.utcnow().isoformat(),
+        "workspace_dir": workspace_dir,
+        "uploaded_files_section": uploaded_files_section,
+    }
+    header = "".join([
+        literal + values[field_name] if field_name is not None else literal
+        for literal, field_name in _CLAUDE_MD_HEADER_PARTS
+    ])
+    return header.encode("utf-8") + _CLAUDE_MD_TAIL_BYTES
+
+
+# Saved-session context appended to CLAUDE.md by save_project. Its byte offset is
+# kept in a sidecar so the next save can truncate there instead of rewriting the file
+SESSION_CONTEXT_PREFIX = "\n\n---\n\n## 📋 SAVED SESSION CONTEXT\n".encode("utf-8")
+SESSION_CONTEXT_OFFSET_FILE = ".claude_md_context_offset"
+SESSION_CONTEXT_RE = re.compile(r"---\s*## 📋 SAVED SESSION CONTEXT")
+
 
 class CastRecorder:
     """Records terminal sessions in asciinema .cast v2 format.
@@ -554,18 +709,24 @@ class CastRecorder:
       - time_offset: seconds since recording start (float)
 
     Uses buffered writes to avoid flushing on every event. The buffer is
-    flushed periodically (every FLUSH_INTERVAL_EVENTS events or on close).
+    written once FLUSH_BYTES are pending or FLUSH_INTERVAL has passed since
+    the last flush (checked as events arrive), and on close, with os.write on
+    an append fd held open for the recorder's lifetime.
     """
 
-    FLUSH_INTERVAL_EVENTS = 50  # Flush buffer every N events
+    FLUSH_BYTES = 64 * 1024  # Flush once this much is buffered (bounds RAM on paste floods)
+    FLUSH_INTERVAL = 0.5  # ...or when this many seconds have passed since the last flush
 
     def __init__(self, cast_path: Path, width: int = 80, height: int = 24):
         self.cast_path = cast_path
-        self.start_time = time.time()
+        self.start_time = time.time()  # Wall clock, for the header timestamp only
+        self._mono_start = time.monotonic()  # Event offsets: immune to clock adjustments
+        self._last_flush = self._mono_start
         self._closed = False
-        self._buffer: list[str] = []
+        self._buffer = bytearray()  # Encoded, newline-terminated event lines
         self._event_count = 0
         self._time_offset_base = 0.0
+        self._fd = -1
 
         try:
             # Check if cast file already exists with content (resume scenario)
@@ -577,8 +738,8 @@ class CastRecorder:
                     "o",
                     "\r\n\x1b[90m--- Session Resumed ---\x1b[0m\r\n"
                 ])
-                with open(cast_path, "a", encoding="utf-8") as f:
-                    f.write(resume_marker + "\n")
+                self._fd = os.open(cast_path, os.O_WRONLY | os.O_APPEND | os.O_CLOEXEC)
+                self._write_all((resume_marker + "\n").encode("utf-8"))
                 self._time_offset_base += 0.2  # Small gap after marker
                 logger.debug(f"CastRecorder resuming: {cast_path} (offset={self._time_offset_base:.2f}s)")
             else:
@@ -590,12 +751,17 @@ class CastRecorder:
                     "timestamp": int(self.start_time),
                     "env": {"TERM": "xterm-256color", "SHELL": "/bin/bash"}
                 })
-                with open(cast_path, "w", encoding="utf-8") as f:
-                    f.write(header + "\n")
+                self._fd = os.open(
+                    cast_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND | os.O_CLOEXEC, 0o644
+                )
+                self._write_all((header + "\n").encode("utf-8"))
                 logger.debug(f"CastRecorder started: {cast_path}")
         except Exception as e:
             logger.warning(f"Failed to create/resume cast file {cast_path}: {e}")
             self._closed = True  # Disable recording if file can't be created
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
 
     @staticmethod
     def _read_last_timestamp(cast_path: Path) -> float:
@@ -623,11 +789,11 @@ class CastRecorder:
             logger.debug(f"Could not read last timestamp from {cast_path}: {e}")
         return 0.0
 
-    def record_output(self, data: bytes):
-        """Record an output event."""
+    def record_output(self, data: bytes, text: Optional[str] = None):
+        """Record an output event. Pass text if the caller already decoded data."""
         if self._closed:
             return
-        self._write_event("o", data)
+        self._write_event("o", data, text)
 
     def record_input(self, data: bytes):
         """Record an input event."""
@@ -635,42 +801,222 @@ class CastRecorder:
             return
         self._write_event("i", data)
 
-    def _write_event(self, event_type: str, data: bytes):
+    def _write_event(self, event_type: str, data: bytes, text: Optional[str] = None):
         """Buffer a single event, flushing periodically."""
         try:
-            elapsed = self._time_offset_base + (time.time() - self.start_time)
-            text = data.decode("utf-8", errors="replace")
-            # json.dumps handles escaping of newlines, quotes, backslashes
-            line = json.dumps([round(elapsed, 6), event_type, text])
-            self._buffer.append(line)
+            now = time.monotonic()
+            elapsed = self._time_offset_base + (now - self._mono_start)
+            if text is None:
+                text = data.decode("utf-8", errors="replace")
+            # Fixed [time, type, data] layout built directly; json.dumps only escapes
+            # the data (newlines, quotes, backslashes, control chars)
+            line = f'[{elapsed:.6f}, "{event_type}", {json.dumps(text)}]\n'
+            self._buffer += line.encode("utf-8")
             self._event_count += 1
 
-            # Flush buffer periodically
-            if self._event_count % self.FLUSH_INTERVAL_EVENTS == 0:
+            # Flush by size or age, whichever comes first
+            if len(self._buffer) >= self.FLUSH_BYTES or now - self._last_flush >= self.FLUSH_INTERVAL:
                 self._flush()
         except Exception as e:
-            logger.debug(f"Cast recording write error: {e}")
+            logger.debug("Cast recording write error: %s", e)
 
     def _flush(self):
         """Write buffered events to disk."""
+        self._last_flush = time.monotonic()
         if not self._buffer:
             return
         try:
-            with open(self.cast_path, "a", encoding="utf-8") as f:
-                f.write("\n".join(self._buffer) + "\n")
+            self._write_all(self._buffer)
             self._buffer.clear()
         except Exception as e:
-            logger.debug(f"Cast recording flush error: {e}")
+            logger.debug("Cast recording flush error: %s", e)
+
+    def _write_all(self, data):
+        """os.write all of data to the cast file (looping on short writes)."""
+        view = memoryview(data)
+        try:
+            while view:
+                view = view[os.write(self._fd, view):]
+        finally:
+            view.release()
 
     def close(self):
         """Flush remaining buffer and mark recording as complete."""
         if not self._closed:
             self._flush()
         self._closed = True
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
         logger.debug(f"CastRecorder closed: {self.cast_path} ({self._event_count} events)")
 
 
-@dataclass
+# Entries of the global ~/.claude shared with each workspace's .claude directory
+CLAUDE_CONFIG_COPIES = (("settings.json", 0o644), (".credentials.json", 0o600))
+CLAUDE_CONFIG_SYMLINKS = ("plugins", "skills", "statsig", "cache")
+
+
+COPY_FILE_RANGE_CHUNK = 64 * 1024 * 1024  # Max bytes per copy_file_range call
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int) - share extents with another file
+_no_reflink_devices: set = set()  # (src st_dev, dst st_dev) pairs where FICLONE was refused
+PROJECT_TRASH_PREFIX = ".trash-"  # Deleted projects awaiting background removal
+
+
+def _try_reflink(src_fd: int, dst_fd: int) -> bool:
+    """
+    Clone src into dst with the FICLONE ioctl (btrfs, XFS with reflink).
+
+    The clone shares data extents, so it costs O(metadata) regardless of
+    file size. Device pairs that refuse it are remembered and not retried.
+    """
+    devices = (os.fstat(src_fd).st_dev, os.fstat(dst_fd).st_dev)
+    if devices in _no_reflink_devices:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError:
+        _no_reflink_devices.add(devices)
+        return False
+
+
+def _fast_copy(src, dst, *, follow_symlinks: bool = True):
+    """
+    copytree copy_function that copies file data inside the kernel.
+
+    On copy-on-write filesystems the file is cloned with FICLONE (no data
+    copied at all). Otherwise uses os.copy_file_range, which never moves data
+    through userspace. Falls back to shutil.copy2 where the syscall is
+    unavailable or refused (old kernels, cross-filesystem copies on kernels
+    before 5.3, special files).
+    """
+    if (
+        not hasattr(os, "copy_file_range")
+        or not os.path.isfile(src)
+        or (not follow_symlinks and os.path.islink(src))
+    ):
+        return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+            if not _try_reflink(src_fd, dst_fd):
+                while os.copy_file_range(src_fd, dst_fd, COPY_FILE_RANGE_CHUNK):
+                    pass
+    except OSError:
+        return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+    shutil.copystat(src, dst, follow_symlinks=follow_symlinks)
+    return dst
+
+
+def _copy_config_file(src: Path, dst: Path, mode: int) -> None:
+    """
+    Copy a small config file in-kernel and give the copy exactly `mode`.
+
+    Skips shutil's stat/permission-copy steps; the mode is set explicitly so
+    credentials are never readable by others, even if dst already existed.
+    """
+    src_fd = os.open(src, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, mode)
+        try:
+            os.fchmod(dst_fd, mode)
+            try:
+                while os.copy_file_range(src_fd, dst_fd, COPY_FILE_RANGE_CHUNK):
+                    pass
+            except (AttributeError, OSError):
+                # No copy_file_range (old kernel/platform): plain read/write loop
+                os.lseek(src_fd, 0, os.SEEK_SET)
+                os.ftruncate(dst_fd, 0)
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+                while chunk := os.read(src_fd, COPY_FILE_RANGE_CHUNK):
+                    view = memoryview(chunk)
+                    while view:
+                        view = view[os.write(dst_fd, view):]
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+# Not copied into saved projects: Claude's per-workspace config, VCS data and
+# regenerable dependency/cache directories (often most of a workspace's size)
+PROJECT_SAVE_IGNORE = frozenset({
+    ".claude", ".git", "__pycache__", "node_modules", ".venv", "venv",
+    ".next", ".cache", ".pytest_cache", ".mypy_cache",
+    SESSION_CONTEXT_OFFSET_FILE,
+})
+# Project bookkeeping not copied back into a restored workspace
+PROJECT_RESTORE_IGNORE = frozenset({".project_metadata.json", ".claude_history", SESSION_CONTEXT_OFFSET_FILE})
+
+
+def _ignore_for_save(directory, names) -> List[str]:
+    """copytree ignore callback for save_project (set lookups, no fnmatch)."""
+    return [name for name in names if name in PROJECT_SAVE_IGNORE or name.endswith(".pyc")]
+
+
+def _ignore_for_restore(directory, names) -> List[str]:
+    """copytree ignore callback for restore_project."""
+    return [name for name in names if name in PROJECT_RESTORE_IGNORE]
+
+
+def _copy_tree_recording(src: Path, dst: Path, ignore) -> List[str]:
+    """
+    copytree src to dst (in-kernel file copies) and return the copied files'
+    paths relative to dst, recorded during the copy so no second walk is needed.
+    """
+    copied_files: List[str] = []
+    root = str(dst)
+
+    def copy_and_record(src_file, dst_file, *, follow_symlinks=True):
+        copied_files.append(os.path.relpath(dst_file, root))
+        return _fast_copy(src_file, dst_file, follow_symlinks=follow_symlinks)
+
+    shutil.copytree(src, dst, ignore=ignore, copy_function=copy_and_record)
+    return copied_files
+
+
+def _rmtree(path, ignore_errors: bool = False) -> None:
+    """
+    Remove a directory tree with a single native `rm -rf`.
+
+    Workspaces routinely hold thousands of node_modules/.git entries; one rm
+    process unlinks them far faster than shutil.rmtree's per-entry Python
+    walk. Falls back to shutil.rmtree if rm is unavailable. Blocking - call
+    it from a worker thread on async paths.
+    """
+    try:
+        result = subprocess.run(
+            ["rm", "-rf", "--", os.fspath(path)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+    except OSError:
+        shutil.rmtree(path, ignore_errors=ignore_errors)
+        return
+    if result.returncode != 0 and not ignore_errors:
+        raise OSError(f"rm -rf {path} failed: {result.stderr.decode(errors='replace').strip()}")
+
+
+def _iter_relative_files(root: str):
+    """
+    Yield paths of regular files under root, relative to root.
+
+    Iterative os.scandir walk: file types come from the directory entries,
+    so there is no extra stat() or Path object per entry. Symlinks are not
+    followed.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield os.path.relpath(entry.path, root)
+
+
+@dataclass(slots=True)
 class ClaudeProcess:
     """Container for Claude Code process state"""
     process: Any  # pexpect.spawn
@@ -679,8 +1025,11 @@ class ClaudeProcess:
     created_at: datetime
     read_task: Optional[asyncio.Task] = None
     is_alive: bool = True
-    log_file_path: Optional[Path] = None  # Path to log file (opened per write to avoid leaks)
-    last_activity: datetime = field(default_factory=datetime.utcnow)  # Track last activity for timeout
+    log_file_path: Optional[Path] = None  # Path to log file
+    log_fd: int = -1  # Append fd for log_file_path, opened on first flush, closed with the log
+    log_buffer: bytearray = field(default_factory=bytearray)  # Pending raw log bytes, written in batches
+    log_flush_handle: Optional[asyncio.TimerHandle] = None  # Pending timed flush of log_buffer
+    last_activity: float = field(default_factory=time.monotonic)  # time.monotonic() of last I/O, for idle timeout
     # Automation state
     output_buffer: str = ""  # Rolling buffer of recent output for pattern matching
     triggered_rules: set = field(default_factory=set)  # Track "once" rules that have fired
@@ -693,12 +1042,63 @@ class ClaudeProcess:
 class CCResearchManager:
     """Manages Claude Code CLI processes for research sessions"""
 
+    LOG_FLUSH_THRESHOLD = 64 * 1024  # Write the session log once this many bytes are pending
+    LOG_FLUSH_INTERVAL = 0.016  # ...or this many seconds after the first pending chunk
+    OUTPUT_COALESCE_MIN = 4096  # Reads this large mean bulk output: coalesce before sending
+    OUTPUT_COALESCE_DELAY = 0.002  # Keep gathering while more output arrives within this window
+    SHUTDOWN_CONCURRENCY = 16  # Sessions terminated in parallel by shutdown()
+    EXIT_CHECK_INTERVAL = 1.0  # Re-check isalive() this often while the PTY is quiet
+
     def __init__(self):
         self.processes: Dict[str, ClaudeProcess] = {}
+        # Background workspace removals (kept referenced so they aren't garbage collected)
+        self._pending_deletes: set = set()
+        # Bounded pool for tree removals so big deletes never block the event loop
+        self._delete_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ccresearch-delete")
+        # Caps concurrent fork+exec of session processes so a burst of session
+        # creates queues up instead of forking everything at once
+        self._spawn_sem = asyncio.Semaphore(max(1, settings.CCRESEARCH_MAX_CONCURRENT_SPAWNS))
+        # session id -> [lock, users], see _session_spawn_guard
+        self._spawn_locks: Dict[str, list] = {}
         # Use config paths for SSD storage
         self.BASE_DIR = Path(settings.CLAUDE_WORKSPACES_DIR)
         self.PROJECTS_DIR = Path(settings.CCRESEARCH_DATA_DIR)
+        # String forms for os.* calls in per-entry loops (no Path arithmetic there)
+        self._base_dir_str = os.fspath(self.BASE_DIR)
+        self._projects_dir_str = os.fspath(self.PROJECTS_DIR)
         self.LOGS_DIR = Path(settings.CCRESEARCH_LOGS_DIR)
+        # Home-relative paths used on every spawn/restore (Path.home() re-reads $HOME/pwd)
+        self.HOME_DIR = Path.home()
+        self.GLOBAL_CLAUDE_DIR = self.HOME_DIR / ".claude"
+        self.CLAUDE_PROJECTS_DIR = self.GLOBAL_CLAUDE_DIR / "projects"
+        self._claude_bin: Optional[str] = None  # Resolved claude CLI path, see _find_claude_bin
+        self._global_claude_present: Optional[frozenset] = None  # See _global_claude_entries
+        # Keys every spawn sets on top of a fresh copy of os.environ (copied per spawn
+        # so later environment changes still reach new sessions).
+        # API keys come from centralized config (pydantic-settings doesn't export to os.environ)
+        self._env_overrides: Dict[str, str] = {
+            'TERM': 'xterm-256color',
+            'FORCE_COLOR': '1',
+            'COLORTERM': 'truecolor',
+            # Global node_modules so sessions can use globally installed packages (pptxgenjs, playwright, etc.)
+            'NODE_PATH': '/usr/lib/node_modules',
+        }
+        if settings.OPENAI_API_KEY:
+            self._env_overrides['OPENAI_API_KEY'] = settings.OPENAI_API_KEY
+        if settings.TAVILY_API_KEY:
+            self._env_overrides['TAVILY_API_KEY'] = settings.TAVILY_API_KEY
+        # Claude sessions additionally pin HOME so Claude finds the global config
+        self._claude_env_overrides: Dict[str, str] = {**self._env_overrides, 'HOME': str(self.HOME_DIR)}
+        # Shared Node.js compile cache (Node >= 22.1, ignored by older versions): the
+        # first spawn stores the CLI's compiled bytecode, later spawns skip recompiling.
+        # Used unless the server's environment already sets NODE_COMPILE_CACHE.
+        self._node_compile_cache = str(self.HOME_DIR / ".cache" / "ccresearch-node-compile")
+        # metadata path -> (mtime_ns, parsed metadata), see list_saved_projects
+        self._project_meta_cache: Dict[str, Tuple[int, dict]] = {}
+        # project name -> ((inode, mtime_ns) of project dir, file list), see list_project_files
+        self._project_files_cache: Dict[str, Tuple[Tuple[int, int], List[str]]] = {}
+        # (global settings.local.json stamp, merged settings bytes), see _merged_settings_local_bytes
+        self._merged_settings_cache: Optional[Tuple[Optional[Tuple[int, int]], bytes]] = None
         # Ensure directories exist
         self.BASE_DIR.mkdir(parents=True, exist_ok=True)
         self.PROJECTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -733,37 +1133,28 @@ class CCResearchManager:
         workspace = self.BASE_DIR / ccresearch_id
         workspace.mkdir(parents=True, exist_ok=True)
 
-        # Create directory structure
-        (workspace / "data").mkdir(exist_ok=True)      # User uploads
-        (workspace / "output").mkdir(exist_ok=True)    # Results/outputs
-        (workspace / "scripts").mkdir(exist_ok=True)   # User scripts
-        (workspace / ".pip-cache").mkdir(exist_ok=True)  # Pip cache
+        # Create directory structure: data/ (user uploads), output/ (results),
+        # scripts/ (user scripts), .pip-cache/ (pip downloads), .claude/ (project settings)
+        for subdir in ("data", "output", "scripts", ".pip-cache", ".claude"):
+            (workspace / subdir).mkdir(exist_ok=True)
 
-        # Build uploaded files section if files exist
-        uploaded_files_section = ""
-        if uploaded_files:
-            # Format as markdown table rows
-            file_list = "\n".join([f"| `{f}` | `data/{f}` |" for f in uploaded_files])
-            uploaded_files_section = UPLOADED_FILES_SECTION.format(file_list=file_list)
+        # Build uploaded files section
+        uploaded_files_section = build_uploaded_files_section(uploaded_files)
 
         # Write CLAUDE.md with session info
         claude_md_path = workspace / "CLAUDE.md"
-        claude_md_content = CLAUDE_MD_TEMPLATE.format(
+        claude_md_content = render_claude_md(
             session_id=ccresearch_id,
-            email=email or "Not provided",
-            created_at=datetime.utcnow().isoformat(),
+            email=email,
             workspace_dir=str(workspace),
             uploaded_files_section=uploaded_files_section
         )
-        claude_md_path.write_text(claude_md_content)
+        write_file_bytes(claude_md_path, claude_md_content)
 
-        # Create .claude directory with project-level settings
+        # Project-level settings in .claude/
         # This helps restrict Claude from reading parent CLAUDE.md files
-        claude_dir = workspace / ".claude"
-        claude_dir.mkdir(parents=True, exist_ok=True)
-
-        settings_local_path = claude_dir / "settings.local.json"
-        settings_local_path.write_text(json.dumps(CCRESEARCH_PERMISSIONS_TEMPLATE, indent=2))
+        settings_local_path = workspace / ".claude" / "settings.local.json"
+        write_file_bytes(settings_local_path, CCRESEARCH_PERMISSIONS_JSON_BYTES)
 
         logger.info(f"Created workspace: {workspace}")
         logger.debug(f"  - Directories: data/, output/, scripts/, .pip-cache/, .claude/")
@@ -791,21 +1182,17 @@ class CCResearchManager:
         workspace = Path(workspace_dir)
         claude_md_path = workspace / "CLAUDE.md"
 
-        # Build uploaded files section (markdown table format)
-        uploaded_files_section = ""
-        if uploaded_files:
-            file_list = "\n".join([f"| `{f}` | `data/{f}` |" for f in uploaded_files])
-            uploaded_files_section = UPLOADED_FILES_SECTION.format(file_list=file_list)
+        # Build uploaded files section
+        uploaded_files_section = build_uploaded_files_section(uploaded_files)
 
         # Write updated CLAUDE.md (sandbox version)
-        claude_md_content = CLAUDE_MD_TEMPLATE.format(
+        claude_md_content = render_claude_md(
             session_id=ccresearch_id,
-            email=email or "Not provided",
-            created_at=datetime.utcnow().isoformat(),
+            email=email,
             workspace_dir=str(workspace),
             uploaded_files_section=uploaded_files_section
         )
-        claude_md_path.write_text(claude_md_content)
+        write_file_bytes(claude_md_path, claude_md_content)
         logger.info(f"Updated CLAUDE.md with {len(uploaded_files or [])} files for session {ccresearch_id}")
 
     def _create_session_log(self, ccresearch_id: str, workspace_dir: Path) -> Path:
@@ -840,23 +1227,68 @@ Log File:       {log_path}
 ================================================================================
 
 """
-        with open(log_path, "a", encoding="utf-8", errors="replace") as f:
-            f.write(header)
+        fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC, 0o644)
+        try:
+            os.write(fd, header.encode("utf-8", errors="replace"))
+        finally:
+            os.close(fd)
 
         logger.info(f"Created session log: {log_path}")
         return log_path
 
+    def _append_log(self, process_info: ClaudeProcess, data: bytes):
+        """
+        Queue bytes for the session log.
+
+        The buffer is written once LOG_FLUSH_THRESHOLD is reached, otherwise by a
+        timer LOG_FLUSH_INTERVAL after the first queued chunk, so bursts of PTY
+        output become a few large writes and idle sessions still land on disk promptly.
+        """
+        process_info.log_buffer += data
+        if len(process_info.log_buffer) >= self.LOG_FLUSH_THRESHOLD:
+            self._flush_session_log(process_info)
+        elif process_info.log_flush_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No event loop to schedule on - write through
+                self._flush_session_log(process_info)
+                return
+            process_info.log_flush_handle = loop.call_later(
+                self.LOG_FLUSH_INTERVAL, self._flush_session_log, process_info
+            )
+
+    def _flush_session_log(self, process_info: ClaudeProcess):
+        """Write pending log bytes to the session log file in a single append."""
+        if process_info.log_flush_handle is not None:
+            process_info.log_flush_handle.cancel()
+            process_info.log_flush_handle = None
+        if not process_info.log_buffer or not process_info.log_file_path:
+            return
+        try:
+            if process_info.log_fd < 0:
+                process_info.log_fd = os.open(
+                    process_info.log_file_path, os.O_WRONLY | os.O_APPEND | os.O_CLOEXEC
+                )
+            view = memoryview(process_info.log_buffer)
+            try:
+                while view:
+                    view = view[os.write(process_info.log_fd, view):]
+            finally:
+                view.release()  # A live export would block resizing the bytearray
+        except Exception as e:
+            logger.debug("Log write error: %s", e)
+        process_info.log_buffer.clear()
+
     def _log_output(self, process_info: ClaudeProcess, data: bytes):
         """Log terminal output to session log file"""
         if process_info.log_file_path:
             try:
-                # Decode bytes to string, replacing non-decodable chars
-                text = data.decode("utf-8", errors="replace")
-                # Write output without timestamp prefix (raw terminal output)
-                with open(process_info.log_file_path, "a", encoding="utf-8", errors="replace") as f:
-                    f.write(text)
+                # Raw terminal output, no timestamp prefix. Bytes go to disk as-is;
+                # readers decode with errors="replace"
+                self._append_log(process_info, data)
             except Exception as e:
-                logger.debug(f"Log write error: {e}")
+                logger.debug("Log write error: %s", e)
 
     def _log_input(self, process_info: ClaudeProcess, data: bytes):
         """Log terminal input to session log file"""
@@ -868,11 +1300,12 @@ Log File:       {log_path}
                 # They'll be echoed in output anyway for visibility
                 # But we can add a marker for clarity if it's a substantial input
                 if len(text) > 1 and text.strip():
-                    # Mark multi-char input (like pasted text) distinctly
-                    with open(process_info.log_file_path, "a", encoding="utf-8", errors="replace") as f:
-                        f.write(f"[INPUT] {text}")
+                    # Mark multi-char input (like pasted text) distinctly. Input is a
+                    # natural boundary, so write out everything pending up to here.
+                    self._append_log(process_info, b"[INPUT] " + data)
+                    self._flush_session_log(process_info)
             except Exception as e:
-                logger.debug(f"Log input error: {e}")
+                logger.debug("Log input error: %s", e)
 
     def _close_session_log(self, process_info: ClaudeProcess):
         """Write session end footer to log file"""
@@ -884,11 +1317,15 @@ Log File:       {log_path}
 SESSION ENDED: {datetime.utcnow().isoformat()}
 ================================================================================
 """
-                with open(process_info.log_file_path, "a", encoding="utf-8", errors="replace") as f:
-                    f.write(footer)
+                self._append_log(process_info, footer.encode("utf-8"))
+                self._flush_session_log(process_info)
                 logger.info(f"Closed session log for {process_info.ccresearch_id}")
             except Exception as e:
                 logger.error(f"Error writing log footer: {e}")
+            finally:
+                if process_info.log_fd >= 0:
+                    os.close(process_info.log_fd)
+                    process_info.log_fd = -1
 
     # ========================================================================
     # CAST RECORDING - Asciinema .cast v2 format
@@ -1053,11 +1490,7 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
 
             # Log the automation
             if process_info.log_file_path:
-                try:
-                    with open(process_info.log_file_path, "a", encoding="utf-8", errors="replace") as f:
-                        f.write(f"\n[AUTO] {description}\n")
-                except Exception:
-                    pass
+                self._append_log(process_info, f"\n[AUTO] {description}\n".encode("utf-8"))
 
             # Notify WebSocket client about automation
             if process_info.automation_callback:
@@ -1128,36 +1561,22 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
         Returns:
             Cleaned, human-readable log
         """
-        import re
-
         # Remove ANSI escape sequences (colors, cursor, etc.)
-        # Matches: ESC[ ... m (SGR), ESC[ ... H (cursor), ESC[ ... J (clear), etc.
-        ansi_escape = re.compile(r'\x1b\[[0-9;]*[a-zA-Z]|\x1b\][^\x07]*\x07|\x1b[<>=].')
-        content = ansi_escape.sub('', content)
+        content = _ANSI_ESCAPE_RE.sub('', content)
 
         # Remove other escape sequences (like ESC?)
-        content = re.sub(r'\x1b[^a-zA-Z]*[a-zA-Z]', '', content)
-        content = re.sub(r'\x1b.', '', content)
+        content = _OTHER_ESCAPE_RE.sub('', content)
+        content = _BARE_ESCAPE_RE.sub('', content)
 
         # Remove carriage returns
         content = content.replace('\r', '')
 
         # Remove [INPUT] markers
-        content = re.sub(r'\[INPUT\]\s*', '', content)
-
-        # Remove null bytes and other control characters (except newlines and tabs)
-        content = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', content)
-
-        # Remove box-drawing characters (Unicode block 2500-257F)
-        # These are used for terminal UI borders and don't add content value
-        content = re.sub(r'[\u2500-\u257F]+', '', content)
+        content = _INPUT_MARKER_RE.sub('', content)
 
-        # Remove block elements (Unicode 2580-259F) - these are fill characters
-        content = re.sub(r'[\u2580-\u259F]+', '', content)
-
-        # Remove other decorative Unicode (bullets, arrows, symbols in common ranges)
-        # Keep useful ones like checkmarks and crosses
-        content = re.sub(r'[\u25A0-\u25FF]', '', content)  # Geometric shapes (squares, circles used as decorations)
+        # Remove control characters (except newlines and tabs) and decorative
+        # box-drawing / block / geometric-shape characters in a single pass
+        content = _DECORATIVE_CHARS_RE.sub('', content)
 
         # Process lines
         lines = content.split('\n')
@@ -1175,7 +1594,7 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
                 continue
 
             # Skip lines that are just decorative (very short with no alphanumeric)
-            if stripped and len(stripped) < 5 and not re.search(r'[a-zA-Z0-9]', stripped):
+            if stripped and len(stripped) < 5 and not _ALNUM_RE.search(stripped):
                 continue
 
             # Skip duplicate consecutive lines (terminal often redraws)
@@ -1189,7 +1608,7 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
 
         # Collapse multiple consecutive blank lines
         result = '\n'.join(cleaned_lines)
-        result = re.sub(r'\n{3,}', '\n\n', result)
+        result = _EXCESS_BLANK_LINES_RE.sub('\n\n', result)
 
         return result
 
@@ -1205,6 +1624,11 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
         Returns:
             Log content or None if not found
         """
+        # Include output still pending in a live session's log buffer
+        process_info = self.processes.get(ccresearch_id)
+        if process_info:
+            self._flush_session_log(process_info)
+
         log_path = self.get_session_log_path(ccresearch_id)
         if not log_path or not log_path.exists():
             return None
@@ -1235,6 +1659,10 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
         Returns:
             Concatenated log content or None if not found
         """
+        process_info = self.processes.get(ccresearch_id)
+        if process_info:
+            self._flush_session_log(process_info)
+
         log_paths = self.get_all_session_log_paths(ccresearch_id)
         if not log_paths:
             return None
@@ -1311,6 +1739,21 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
             logger.error(f"Failed to load terminal history: {e}")
         return None
 
+    @asynccontextmanager
+    async def _session_spawn_guard(self, ccresearch_id: str):
+        """Hold the per-session spawn lock (the entry is dropped once nobody uses it)."""
+        entry = self._spawn_locks.get(ccresearch_id)
+        if entry is None:
+            entry = self._spawn_locks[ccresearch_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._spawn_locks[ccresearch_id]
+
     async def spawn_claude(
         self,
         ccresearch_id: str,
@@ -1345,126 +1788,108 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
             logger.error("pexpect not installed. Install with: pip install pexpect")
             return False
 
-        if ccresearch_id in self.processes:
-            proc = self.processes[ccresearch_id]
-            if proc.process.isalive():
-                logger.info(f"Process already exists and alive for {ccresearch_id}, reconnecting output callback")
-                # Process exists - reconnect the output callback for the new WebSocket
-                # Cancel old read task first
-                if proc.read_task:
-                    proc.read_task.cancel()
-                    try:
-                        await proc.read_task
-                    except asyncio.CancelledError:
-                        pass
+        # Serialize spawns per session: two connects for the same id must not both
+        # pass the "already running" check and spawn two processes
+        async with self._session_spawn_guard(ccresearch_id):
+            if ccresearch_id in self.processes:
+                proc = self.processes[ccresearch_id]
+                if proc.process.isalive():
+                    logger.info(f"Process already exists and alive for {ccresearch_id}, reconnecting output callback")
+                    # Process exists - reconnect the output callback for the new WebSocket
+                    # Cancel old read task first
+                    if proc.read_task:
+                        proc.read_task.cancel()
+                        try:
+                            await proc.read_task
+                        except asyncio.CancelledError:
+                            pass
 
-                # Update callbacks
-                proc.automation_callback = automation_callback
+                    # Update callbacks
+                    proc.automation_callback = automation_callback
 
-                # Start new read task with new callback
-                if output_callback:
-                    proc.read_task = asyncio.create_task(
-                        self._async_read_loop(ccresearch_id, output_callback)
-                    )
-                    logger.info(f"Reconnected output callback for {ccresearch_id}")
+                    # Start new read task with new callback
+                    if output_callback:
+                        proc.read_task = asyncio.create_task(
+                            self._async_read_loop(ccresearch_id, output_callback)
+                        )
+                        logger.info(f"Reconnected output callback for {ccresearch_id}")
 
-                return True
-            else:
-                # Clean up dead process
-                await self.terminate_session(ccresearch_id)
+                    return True
+                else:
+                    # Clean up dead process
+                    await self.terminate_session(ccresearch_id)
 
-        try:
-            env = os.environ.copy()
-            env['TERM'] = 'xterm-256color'
-            env['FORCE_COLOR'] = '1'
-            env['COLORTERM'] = 'truecolor'
-            # Ensure Claude Code uses the workspace directory
-            env['PWD'] = str(workspace_dir)
-            env['HOME'] = str(Path.home())  # Needed for Claude to find config
-            # Add global node_modules to NODE_PATH so sessions can use globally installed packages
-            # (pptxgenjs, playwright, etc.)
-            env['NODE_PATH'] = '/usr/lib/node_modules'
-
-            # Inject API keys from centralized config so child processes can use them
-            # (pydantic-settings reads .env into Settings but doesn't export to os.environ)
-            from app.core.config import settings
-            if settings.OPENAI_API_KEY:
-                env['OPENAI_API_KEY'] = settings.OPENAI_API_KEY
-            if settings.TAVILY_API_KEY:
-                env['TAVILY_API_KEY'] = settings.TAVILY_API_KEY
-
-            # Set API key for headless authentication (skips OAuth browser login)
-            # Only use user-provided API key - server's API key is NOT used for ccresearch
-            if api_key:
-                env['ANTHROPIC_API_KEY'] = api_key
-                logger.info(f"Using user-provided API key for headless auth (session {ccresearch_id})")
-
-            # Run Claude Code directly (no sandbox) for full plugin/skill/MCP access
-            # Claude uses global ~/.claude and ~/.claude.json for all configuration
-            # Use --continue flag to resume previous conversation for existing sessions
-            claude_args = ['--continue'] if continue_session else []
+            try:
+                # Ensure Claude Code uses the workspace directory
+                workspace = str(workspace_dir)
+                env = {**os.environ, **self._claude_env_overrides, 'PWD': workspace}
+                env.setdefault('NODE_COMPILE_CACHE', self._node_compile_cache)
+
+                # Set API key for headless authentication (skips OAuth browser login)
+                # Only use user-provided API key - server's API key is NOT used for ccresearch
+                if api_key:
+                    env['ANTHROPIC_API_KEY'] = api_key
+                    logger.info(f"Using user-provided API key for headless auth (session {ccresearch_id})")
+
+                # Run Claude Code directly (no sandbox) for full plugin/skill/MCP access
+                # Claude uses global ~/.claude and ~/.claude.json for all configuration
+                # Use --continue flag to resume previous conversation for existing sessions
+                claude_args = ['--continue'] if continue_session else []
             
-            # Find claude binary - check common locations since PATH may not be set in service
-            claude_bin = shutil.which('claude')
-            if not claude_bin:
-                # Check common install locations (macOS and Linux)
-                home = str(Path.home())
-                search_paths = [
-                    f'{home}/.local/bin/claude',           # User install (both OS)
-                    '/opt/homebrew/bin/claude',            # Homebrew (macOS ARM)
-                    '/usr/local/bin/claude',               # Homebrew (macOS Intel) / Linux
-                    '/usr/bin/claude',                     # System (Linux)
-                ]
-                for path in search_paths:
-                    if os.path.isfile(path) and os.access(path, os.X_OK):
-                        claude_bin = path
-                        break
-            if not claude_bin:
-                raise FileNotFoundError("claude CLI not found in PATH or standard locations")
+                claude_bin = self._find_claude_bin()
+                if not claude_bin:
+                    raise FileNotFoundError("claude CLI not found in PATH or standard locations")
             
-            logger.info(f"Spawning Claude Code for {ccresearch_id} in {workspace_dir} (continue={continue_session}, bin={claude_bin})")
-            process = pexpect.spawn(
-                claude_bin,
-                args=claude_args,
-                cwd=str(workspace_dir),
-                env=env,
-                encoding=None,
-                dimensions=(rows, cols),
-                timeout=None
-            )
-
-            # Create session log file
-            log_file_path = self._create_session_log(ccresearch_id, workspace_dir)
-
-            # Create .cast recorder for terminal recording
-            cast_recorder = self._create_cast_recorder(ccresearch_id, cols, rows)
-
-            # Store process info
-            self.processes[ccresearch_id] = ClaudeProcess(
-                process=process,
-                workspace_dir=workspace_dir,
-                ccresearch_id=ccresearch_id,
-                created_at=datetime.utcnow(),
-                log_file_path=log_file_path,
-                automation_callback=automation_callback,
-                cast_recorder=cast_recorder
-            )
-
-            # Start async read task if callback provided
-            if output_callback:
-                self.processes[ccresearch_id].read_task = asyncio.create_task(
-                    self._async_read_loop(ccresearch_id, output_callback)
+                logger.info(f"Spawning Claude Code for {ccresearch_id} in {workspace_dir} (continue={continue_session}, bin={claude_bin})")
+                # fork+exec of a large server process can take tens of ms; do it in a
+                # worker thread so other sessions' I/O keeps flowing meanwhile
+                async with self._spawn_sem:
+                    process = await asyncio.to_thread(
+                        pexpect.spawn,
+                        claude_bin,
+                        args=claude_args,
+                        cwd=workspace,
+                        env=env,
+                        encoding=None,
+                        dimensions=(rows, cols),
+                        timeout=None,
+                        preexec_fn=_set_resource_limits
+                    )
+                # The read loop drains the PTY until EAGAIN; writes wait for room
+                os.set_blocking(process.child_fd, False)
+
+                # Create session log file
+                log_file_path = self._create_session_log(ccresearch_id, workspace_dir)
+
+                # Create .cast recorder for terminal recording
+                cast_recorder = self._create_cast_recorder(ccresearch_id, cols, rows)
+
+                # Store process info
+                self.processes[ccresearch_id] = ClaudeProcess(
+                    process=process,
+                    workspace_dir=workspace_dir,
+                    ccresearch_id=ccresearch_id,
+                    created_at=datetime.utcnow(),
+                    log_file_path=log_file_path,
+                    automation_callback=automation_callback,
+                    cast_recorder=cast_recorder
                 )
 
-            logger.info(f"Spawned Claude Code for {ccresearch_id}, PID: {process.pid}")
-            return True
+                # Start async read task if callback provided
+                if output_callback:
+                    self.processes[ccresearch_id].read_task = asyncio.create_task(
+                        self._async_read_loop(ccresearch_id, output_callback)
+                    )
 
-        except FileNotFoundError as e:
-            logger.error(f"Required binary not found: {e}. Ensure 'claude' is in PATH")
-            return False
-        except Exception as e:
-            logger.error(f"Failed to spawn Claude Code: {e}")
-            return False
+                logger.info(f"Spawned Claude Code for {ccresearch_id}, PID: {process.pid}")
+                return True
+
+            except FileNotFoundError as e:
+                logger.error(f"Required binary not found: {e}. Ensure 'claude' is in PATH")
+                return False
+            except Exception as e:
+                logger.error(f"Failed to spawn Claude Code: {e}")
+                return False
 
     async def spawn_shell(
         self,
@@ -1496,95 +1921,119 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
             logger.error("pexpect not installed. Install with: pip install pexpect")
             return False
 
-        if ccresearch_id in self.processes:
-            proc = self.processes[ccresearch_id]
-            if proc.process.isalive():
-                logger.info(f"Shell process already exists for {ccresearch_id}, reconnecting")
-                if proc.read_task:
-                    proc.read_task.cancel()
-                    try:
-                        await proc.read_task
-                    except asyncio.CancelledError:
-                        pass
-
-                if output_callback:
-                    proc.read_task = asyncio.create_task(
-                        self._async_read_loop(ccresearch_id, output_callback)
-                    )
-                return True
-            else:
-                await self.terminate_session(ccresearch_id)
+        # Serialize spawns per session: two connects for the same id must not both
+        # pass the "already running" check and spawn two processes
+        async with self._session_spawn_guard(ccresearch_id):
+            if ccresearch_id in self.processes:
+                proc = self.processes[ccresearch_id]
+                if proc.process.isalive():
+                    logger.info(f"Shell process already exists for {ccresearch_id}, reconnecting")
+                    if proc.read_task:
+                        proc.read_task.cancel()
+                        try:
+                            await proc.read_task
+                        except asyncio.CancelledError:
+                            pass
+
+                    if output_callback:
+                        proc.read_task = asyncio.create_task(
+                            self._async_read_loop(ccresearch_id, output_callback)
+                        )
+                    return True
+                else:
+                    await self.terminate_session(ccresearch_id)
 
-        try:
-            env = os.environ.copy()
-            env['TERM'] = 'xterm-256color'
-            env['FORCE_COLOR'] = '1'
-            env['COLORTERM'] = 'truecolor'
-            # Add global node_modules to NODE_PATH
-            env['NODE_PATH'] = '/usr/lib/node_modules'
-
-            # Inject API keys from centralized config for shell sessions
-            from app.core.config import settings
-            if settings.OPENAI_API_KEY:
-                env['OPENAI_API_KEY'] = settings.OPENAI_API_KEY
-            if settings.TAVILY_API_KEY:
-                env['TAVILY_API_KEY'] = settings.TAVILY_API_KEY
-
-            # Determine working directory (priority order):
-            # 1. Custom working directory if specified and exists
-            # 2. Default project workspace directory
-            if custom_working_dir:
-                custom_path = Path(custom_working_dir)
-                if custom_path.exists() and custom_path.is_dir():
-                    working_dir = custom_path
-                    logger.info(f"Using custom working directory: {working_dir}")
+            try:
+                # Determine working directory (priority order):
+                # 1. Custom working directory if specified and exists
+                # 2. Default project workspace directory
+                if custom_working_dir:
+                    custom_path = Path(custom_working_dir)
+                    if custom_path.exists() and custom_path.is_dir():
+                        working_dir = custom_path
+                        logger.info(f"Using custom working directory: {working_dir}")
+                    else:
+                        logger.warning(f"Custom directory '{custom_working_dir}' does not exist, using workspace")
+                        working_dir = workspace_dir
                 else:
-                    logger.warning(f"Custom directory '{custom_working_dir}' does not exist, using workspace")
                     working_dir = workspace_dir
-            else:
-                working_dir = workspace_dir
-
-            env['PWD'] = str(working_dir)
-
-            logger.info(f"Spawning bash shell for {ccresearch_id} in {working_dir}")
-            process = pexpect.spawn(
-                '/bin/bash',
-                args=['--login'],
-                cwd=str(working_dir),
-                env=env,
-                encoding=None,
-                dimensions=(rows, cols),
-                timeout=None
-            )
 
-            # Create session log file
-            log_file_path = self._create_session_log(ccresearch_id, working_dir)
+                working = str(working_dir)
+                env = {**os.environ, **self._env_overrides, 'PWD': working}
+
+                logger.info(f"Spawning bash shell for {ccresearch_id} in {working_dir}")
+                # fork+exec of a large server process can take tens of ms; do it in a
+                # worker thread so other sessions' I/O keeps flowing meanwhile
+                async with self._spawn_sem:
+                    process = await asyncio.to_thread(
+                        pexpect.spawn,
+                        '/bin/bash',
+                        args=['--login'],
+                        cwd=working,
+                        env=env,
+                        encoding=None,
+                        dimensions=(rows, cols),
+                        timeout=None,
+                        preexec_fn=_set_resource_limits
+                    )
+                # The read loop drains the PTY until EAGAIN; writes wait for room
+                os.set_blocking(process.child_fd, False)
+
+                # Create session log file
+                log_file_path = self._create_session_log(ccresearch_id, working_dir)
+
+                # Create .cast recorder for terminal recording
+                cast_recorder = self._create_cast_recorder(ccresearch_id, cols, rows)
+
+                # Store process info
+                self.processes[ccresearch_id] = ClaudeProcess(
+                    process=process,
+                    workspace_dir=working_dir,
+                    ccresearch_id=ccresearch_id,
+                    created_at=datetime.utcnow(),
+                    log_file_path=log_file_path,
+                    cast_recorder=cast_recorder
+                )
 
-            # Create .cast recorder for terminal recording
-            cast_recorder = self._create_cast_recorder(ccresearch_id, cols, rows)
+                # Start async read task if callback provided
+                if output_callback:
+                    self.processes[ccresearch_id].read_task = asyncio.create_task(
+                        self._async_read_loop(ccresearch_id, output_callback)
+                    )
 
-            # Store process info
-            self.processes[ccresearch_id] = ClaudeProcess(
-                process=process,
-                workspace_dir=working_dir,
-                ccresearch_id=ccresearch_id,
-                created_at=datetime.utcnow(),
-                log_file_path=log_file_path,
-                cast_recorder=cast_recorder
-            )
+                logger.info(f"Spawned bash shell for {ccresearch_id}, PID: {process.pid}")
+                return True
 
-            # Start async read task if callback provided
-            if output_callback:
-                self.processes[ccresearch_id].read_task = asyncio.create_task(
-                    self._async_read_loop(ccresearch_id, output_callback)
-                )
+            except Exception as e:
+                logger.error(f"Failed to spawn bash shell: {e}")
+                return False
 
-            logger.info(f"Spawned bash shell for {ccresearch_id}, PID: {process.pid}")
-            return True
+    def _find_claude_bin(self) -> Optional[str]:
+        """
+        Locate the claude CLI, reusing the last result while it is still executable.
 
-        except Exception as e:
-            logger.error(f"Failed to spawn bash shell: {e}")
-            return False
+        Checks PATH first, then common install locations since PATH may not be
+        set when running as a service.
+        """
+        if self._claude_bin and os.access(self._claude_bin, os.X_OK):
+            return self._claude_bin
+
+        claude_bin = shutil.which('claude')
+        if not claude_bin:
+            # Check common install locations (macOS and Linux)
+            search_paths = [
+                str(self.HOME_DIR / '.local' / 'bin' / 'claude'),  # User install (both OS)
+                '/opt/homebrew/bin/claude',            # Homebrew (macOS ARM)
+                '/usr/local/bin/claude',               # Homebrew (macOS Intel) / Linux
+                '/usr/bin/claude',                     # System (Linux)
+            ]
+            for path in search_paths:
+                if os.path.isfile(path) and os.access(path, os.X_OK):
+                    claude_bin = path
+                    break
+
+        self._claude_bin = claude_bin
+        return claude_bin
 
     async def _async_read_loop(
         self,
@@ -1603,37 +2052,57 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
         process = process_info.process
         callback_failed = False
 
+        # Decide once whether the callback is a coroutine function; sync callables
+        # are called directly and awaited only if they hand back an awaitable
+        callback_is_async = inspect.iscoroutinefunction(callback)
+
+        async def deliver(chunk: bytes):
+            """Send one chunk either way (used for the one-off end-of-session messages)."""
+            result = callback(chunk)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
         while process_info.is_alive and not callback_failed:
             try:
                 if process.isalive():
-                    # Use asyncio.to_thread for blocking read
-                    data = await asyncio.to_thread(
-                        self._read_nonblocking,
-                        process
-                    )
+                    # Sleep in the event loop until the PTY has output (no worker
+                    # thread), then take what is there without blocking. Wake up
+                    # periodically anyway: a background grandchild still holding the
+                    # PTY slave keeps it from reaching EOF after Claude itself exits.
+                    if not await self._wait_readable(process.child_fd, self.EXIT_CHECK_INTERVAL):
+                        continue
+                    data = self._read_nonblocking(process)
+                    if len(data) >= self.OUTPUT_COALESCE_MIN:
+                        data = await self._coalesce_output(process, data)
                     if data:
                         # Update last activity timestamp
-                        process_info.last_activity = datetime.utcnow()
-                        # Log terminal output
+                        process_info.last_activity = time.monotonic()
+                        # Log terminal output (raw bytes, no decode)
                         self._log_output(process_info, data)
 
+                        # Decode once; the cast recorder and output buffer share the text
+                        text = data.decode("utf-8", errors="replace")
+
                         # Record output to .cast file
                         if process_info.cast_recorder:
-                            process_info.cast_recorder.record_output(data)
+                            process_info.cast_recorder.record_output(data, text)
 
                         # Update output buffer for automation pattern matching
                         try:
-                            text = data.decode("utf-8", errors="replace")
                             self._update_output_buffer(process_info, text)
                         except Exception as e:
-                            logger.debug(f"Buffer update error: {e}")
+                            logger.debug("Buffer update error: %s", e)
 
-                        # Call callback (might be async or sync)
+                        # Deliver output to the callback
                         # Callback may return False to signal stop
                         try:
-                            result = callback(data)
-                            if asyncio.iscoroutine(result):
-                                result = await result
+                            if callback_is_async:
+                                result = await callback(data)
+                            else:
+                                result = callback(data)
+                                if inspect.isawaitable(result):
+                                    result = await result
                             # If callback returns False, stop the loop
                             if result is False:
                                 logger.info(f"Callback signaled stop for {ccresearch_id}")
@@ -1650,22 +2119,15 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
                     # Process terminated
                     process_info.is_alive = False
                     try:
-                        result = callback(b'\r\n\x1b[1;33m[Session ended]\x1b[0m\r\n')
-                        if asyncio.iscoroutine(result):
-                            await result
+                        await deliver(b'\r\n\x1b[1;33m[Session ended]\x1b[0m\r\n')
                     except Exception:
                         pass  # Ignore callback errors on final message
                     break
 
-                # Small delay to prevent busy loop
-                await asyncio.sleep(0.01)
-
             except pexpect.EOF:
                 process_info.is_alive = False
                 try:
-                    result = callback(b'\r\n\x1b[1;33m[Session ended - EOF]\x1b[0m\r\n')
-                    if asyncio.iscoroutine(result):
-                        await result
+                    await deliver(b'\r\n\x1b[1;33m[Session ended - EOF]\x1b[0m\r\n')
                 except Exception:
                     pass  # Ignore callback errors on final message
                 break
@@ -1676,14 +2138,85 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
                 logger.error(f"Read error for {ccresearch_id}: {e}")
                 await asyncio.sleep(0.1)  # Prevent tight loop on error
 
-    def _read_nonblocking(self, process: Any, size: int = 4096) -> bytes:
-        """Non-blocking read from pexpect process"""
+        # Process ended or loop stopped - make sure everything read so far is on disk
+        self._flush_session_log(process_info)
+
+    async def _wait_readable(self, fd: int, timeout: Optional[float] = None) -> bool:
+        """Wait until fd is readable (or at EOF) using the event loop's selector.
+
+        Returns False if the timeout elapsed first.
+        """
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(True))
+        timer = None
+        if timeout is not None:
+            timer = loop.call_later(timeout, lambda: ready.done() or ready.set_result(False))
         try:
-            return process.read_nonblocking(size, timeout=0.1)
-        except pexpect.TIMEOUT:
-            return b''
-        except pexpect.EOF:
-            raise
+            return await ready
+        finally:
+            loop.remove_reader(fd)
+            if timer:
+                timer.cancel()
+
+    async def _wait_writable(self, fd: int):
+        """Wait until fd accepts more data, using the event loop's selector."""
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        loop.add_writer(fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            loop.remove_writer(fd)
+
+    async def _coalesce_output(self, process: Any, data: bytes) -> bytes:
+        """
+        Gather a burst of output into one chunk (one WebSocket frame).
+
+        Only called for bulk reads; small ones such as keystroke echo are sent
+        immediately. Keeps reading while more output arrives within
+        OUTPUT_COALESCE_DELAY, up to PTY_READ_SIZE in total.
+        """
+        chunks = [data]
+        total = len(data)
+        while total < PTY_READ_SIZE:
+            if not await self._wait_readable(process.child_fd, self.OUTPUT_COALESCE_DELAY):
+                break
+            try:
+                more = self._read_nonblocking(process, PTY_READ_SIZE - total)
+            except pexpect.EOF:
+                break  # Deliver what we have; EOF surfaces on the next read
+            chunks.append(more)
+            total += len(more)
+        return b''.join(chunks)
+
+    def _read_nonblocking(self, process: Any, size: int = PTY_READ_SIZE) -> bytes:
+        """
+        Drain what the PTY has buffered, up to size bytes (call once the fd is readable).
+
+        Reads straight from the child fd (non-blocking, set at spawn) until it
+        would block, so a burst of output is delivered as one chunk (one log
+        append, one cast event, one WebSocket frame) instead of many 4 KB pieces.
+        Raises pexpect.EOF when the child side has closed.
+        """
+        fd = process.child_fd
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            try:
+                chunk = os.read(fd, remaining)
+            except BlockingIOError:
+                break  # Drained
+            except OSError:
+                # Linux reports a closed PTY as EIO
+                chunk = b''
+            if not chunk:
+                if chunks:
+                    break  # Deliver what we have; EOF surfaces on the next read
+                raise pexpect.EOF('End Of File (EOF) on PTY')
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b''.join(chunks)
 
     async def write_input(self, ccresearch_id: str, data: bytes) -> bool:
         """
@@ -1701,20 +2234,33 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
             logger.warning(f"No process found for {ccresearch_id}")
             return False
 
-        if not process_info.process.isalive():
+        if not process_info.is_alive:
             logger.warning(f"Process not alive for {ccresearch_id}")
             return False
 
         try:
             # Update last activity timestamp
-            process_info.last_activity = datetime.utcnow()
+            process_info.last_activity = time.monotonic()
             # Log input before sending
             self._log_input(process_info, data)
             # Record input to .cast file
             if process_info.cast_recorder:
                 process_info.cast_recorder.record_input(data)
-            process_info.process.send(data)
+            # Write straight to the PTY; a dead child surfaces as EIO/EBADF (child_fd
+            # is -1 once pexpect closes it), so no isalive() poll per keystroke
+            fd = process_info.process.child_fd
+            view = memoryview(data)
+            while view:
+                try:
+                    view = view[os.write(fd, view):]
+                except BlockingIOError:
+                    # PTY input buffer full (large paste): wait until it drains
+                    await self._wait_writable(fd)
             return True
+        except OSError as e:
+            process_info.is_alive = False
+            logger.warning(f"Process not alive for {ccresearch_id}: {e}")
+            return False
         except Exception as e:
             logger.error(f"Write error for {ccresearch_id}: {e}")
             return False
@@ -1730,11 +2276,13 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
             Number of sessions terminated
         """
         terminated = 0
-        cutoff = datetime.utcnow() - timedelta(hours=max_idle_hours)
+        now = time.monotonic()
+        cutoff = now - max_idle_hours * 3600
 
         for session_id, process_info in list(self.processes.items()):
             if process_info.last_activity < cutoff:
-                logger.info(f"Terminating idle session {session_id} (idle since {process_info.last_activity})")
+                idle_minutes = (now - process_info.last_activity) / 60
+                logger.info(f"Terminating idle session {session_id} (idle for {idle_minutes:.0f} min)")
                 await self.terminate_session(session_id)
                 terminated += 1
 
@@ -1761,7 +2309,7 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
 
         try:
             process_info.process.setwinsize(rows, cols)
-            logger.debug(f"Resized terminal for {ccresearch_id}: {rows}x{cols}")
+            logger.debug("Resized terminal for %s: %sx%s", ccresearch_id, rows, cols)
             return True
         except Exception as e:
             logger.error(f"Resize error for {ccresearch_id}: {e}")
@@ -1813,9 +2361,10 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
             # Close session log file (log is preserved in LOGS_DIR)
             self._close_session_log(process_info)
 
-            # Terminate process
+            # Terminate process. pexpect's terminate() sleeps between signals,
+            # so wait in a worker thread rather than blocking the event loop
             if process_info.process.isalive():
-                process_info.process.terminate(force=True)
+                await asyncio.to_thread(process_info.process.terminate, True)
 
             logger.info(f"Terminated session {ccresearch_id}")
             return True
@@ -1824,10 +2373,14 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
             logger.error(f"Termination error for {ccresearch_id}: {e}")
             return False
 
-    def delete_workspace(self, workspace_dir: Path) -> bool:
+    async def delete_workspace(self, workspace_dir: Path) -> bool:
         """
         Delete workspace directory
 
+        The directory is renamed aside immediately so the workspace disappears
+        at once; the tree walk itself runs in a worker thread so large
+        workspaces don't block the event loop.
+
         Args:
             workspace_dir: Path to workspace
 
@@ -1842,7 +2395,7 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
                 except ValueError:
                     logger.error(f"Blocked workspace deletion outside BASE_DIR: {workspace_dir}")
                     return False
-                shutil.rmtree(workspace_dir)
+                self._discard_tree(workspace_dir, f"{workspace_dir.name}.trash-{uuid.uuid4().hex[:8]}")
                 logger.info(f"Deleted workspace: {workspace_dir}")
                 return True
             return False
@@ -1850,10 +2403,22 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
             logger.error(f"Failed to delete workspace: {e}")
             return False
 
+    def _discard_tree(self, path: Path, trash_name: str):
+        """Rename path aside to trash_name, then remove it in the background."""
+        trash_path = path.with_name(trash_name)
+        path.rename(trash_path)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._delete_pool, partial(_rmtree, trash_path, ignore_errors=True))
+        self._pending_deletes.add(future)
+        future.add_done_callback(self._pending_deletes.discard)
+
     async def cleanup_old_sessions(self, max_age_hours: int = 24) -> int:
         """
         Cleanup sessions older than max_age_hours
 
+        Also removes .trash-* directories left behind by removals that were
+        interrupted by a restart.
+
         Args:
             max_age_hours: Maximum age before cleanup
 
@@ -1861,36 +2426,75 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
             Number of sessions cleaned up
         """
         deleted = 0
-        cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+        cutoff = time.time() - max_age_hours * 3600
 
-        for session_dir in self.BASE_DIR.iterdir():
-            if not session_dir.is_dir():
-                continue
+        # One scandir pass; entry type and stat come from the dirent / a single stat call
+        stale: List[Path] = []
+        leftover_trash: List[str] = []
+        with os.scandir(self._base_dir_str) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if ".trash-" in entry.name:
+                        leftover_trash.append(entry.path)
+                    elif entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                        stale.append(Path(entry.path))
+                except OSError as e:
+                    logger.error(f"Cleanup error for {entry.path}: {e}")
+
+        # Terminate running sessions first, one at a time, so no removal races a live process
+        for session_dir in stale:
+            if session_dir.name in self.processes:
+                try:
+                    await self.terminate_session(session_dir.name)
+                except Exception as e:
+                    logger.error(f"Cleanup error for {session_dir}: {e}")
 
+        # Then rename each aside; the tree removals run concurrently on the delete pool
+        for session_dir in stale:
             try:
-                mtime = datetime.fromtimestamp(session_dir.stat().st_mtime)
-                if mtime < cutoff:
-                    session_id = session_dir.name
-
-                    # Terminate if running
-                    if session_id in self.processes:
-                        await self.terminate_session(session_id)
-
-                    # Remove directory
-                    shutil.rmtree(session_dir)
+                if await self.delete_workspace(session_dir):
                     deleted += 1
-                    logger.info(f"Cleaned up old session: {session_id}")
-
+                    logger.info(f"Cleaned up old session: {session_dir.name}")
             except Exception as e:
                 logger.error(f"Cleanup error for {session_dir}: {e}")
 
+        # Remove leftovers concurrently on the delete pool
+        if leftover_trash:
+            loop = asyncio.get_running_loop()
+            results = await asyncio.gather(*(
+                loop.run_in_executor(self._delete_pool, partial(_rmtree, path, ignore_errors=True))
+                for path in leftover_trash
+            ), return_exceptions=True)
+            for path, result in zip(leftover_trash, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Cleanup error for {path}: {result}")
+
         return deleted
 
     async def shutdown(self):
         """Shutdown all processes gracefully"""
         logger.info("Shutting down CCResearchManager...")
-        for session_id in list(self.processes.keys()):
-            await self.terminate_session(session_id)
+        # Terminate sessions concurrently so their exit waits overlap; bounded so a
+        # restart with many live sessions doesn't signal them all at once
+        limit = asyncio.Semaphore(self.SHUTDOWN_CONCURRENCY)
+
+        async def terminate(session_id: str):
+            async with limit:
+                await self.terminate_session(session_id)
+
+        results = await asyncio.gather(
+            *(terminate(session_id) for session_id in list(self.processes.keys())),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error terminating session during shutdown: {result}")
+        # Let in-flight background removals finish so no half-deleted trash is left
+        if self._pending_deletes:
+            await asyncio.gather(*self._pending_deletes, return_exceptions=True)
+        self._delete_pool.shutdown(wait=False)
         logger.info("CCResearchManager shutdown complete")
 
     def _get_claude_project_path(self, workspace_dir: Path) -> Optional[Path]:
@@ -1916,8 +2520,7 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
         else:
             project_name = '-' + project_name
 
-        claude_projects_dir = Path.home() / ".claude" / "projects"
-        project_path = claude_projects_dir / project_name
+        project_path = self.CLAUDE_PROJECTS_DIR / project_name
 
         if project_path.exists():
             return project_path
@@ -1946,8 +2549,7 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
                 if not dest_project_name.startswith('-'):
                     dest_project_name = '-' + dest_project_name
 
-                claude_projects_dir = Path.home() / ".claude" / "projects"
-                dest_project_path = claude_projects_dir / dest_project_name
+                dest_project_path = self.CLAUDE_PROJECTS_DIR / dest_project_name
                 dest_project_path.mkdir(parents=True, exist_ok=True)
 
                 # Copy history files
@@ -1962,7 +2564,7 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
             logger.error(f"Failed to copy conversation history: {e}")
             return False
 
-    def save_project(
+    async def save_project(
         self,
         workspace_dir: Path,
         project_name: str,
@@ -2000,24 +2602,16 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
 
             # Copy workspace to project directory
             if project_path.exists():
-                # Overwrite existing project
-                shutil.rmtree(project_path)
-
-            shutil.copytree(
-                workspace_dir,
-                project_path,
-                ignore=shutil.ignore_patterns('.claude', '__pycache__', '*.pyc', '.git')
+                # Overwrite existing project (old copy is removed in the background)
+                self._discard_tree(project_path, f"{PROJECT_TRASH_PREFIX}{uuid.uuid4().hex[:8]}-{safe_name}")
+
+            # Copy the tree and locate Claude's conversation history concurrently,
+            # both off the event loop
+            copied_files, claude_project = await asyncio.gather(
+                asyncio.to_thread(_copy_tree_recording, workspace_dir, project_path, _ignore_for_save),
+                asyncio.to_thread(self._get_claude_project_path, workspace_dir),
             )
 
-            # Save Claude's conversation history
-            claude_project = self._get_claude_project_path(workspace_dir)
-            if claude_project:
-                history_dest = project_path / ".claude_history"
-                history_dest.mkdir(exist_ok=True)
-                for history_file in claude_project.glob("*.jsonl"):
-                    shutil.copy(history_file, history_dest / history_file.name)
-                    logger.info(f"Saved conversation history: {history_file.name}")
-
             # Write metadata file (includes email for ownership)
             metadata = {
                 "name": safe_name,
@@ -2026,10 +2620,25 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
                 "source_workspace": str(workspace_dir),
                 "saved_at": datetime.utcnow().isoformat(),
                 "has_conversation_history": claude_project is not None,
-                "files": [str(f.relative_to(project_path)) for f in project_path.rglob("*") if f.is_file()]
             }
-            metadata_path = project_path / ".project_metadata.json"
-            metadata_path.write_text(json.dumps(metadata, indent=2))
+
+            def save_history_and_metadata():
+                # Save Claude's conversation history
+                if claude_project:
+                    history_dest = project_path / ".claude_history"
+                    history_dest.mkdir(exist_ok=True)
+                    for history_file in claude_project.glob("*.jsonl"):
+                        shutil.copy(history_file, history_dest / history_file.name)
+                        copied_files.append(os.path.join(".claude_history", history_file.name))
+                        logger.info(f"Saved conversation history: {history_file.name}")
+                metadata_path = project_path / ".project_metadata.json"
+                metadata_path.write_bytes(_dump_json_bytes(metadata))
+
+            await asyncio.to_thread(save_history_and_metadata)
+
+            # Seed list_project_files with what was just copied
+            st = project_path.stat()
+            self._project_files_cache[safe_name] = ((st.st_ino, st.st_mtime_ns), copied_files)
 
             from app.core.security import mask_email
             logger.info(f"Saved project '{safe_name}' by {mask_email(email)} to {project_path}")
@@ -2039,6 +2648,35 @@ SESSION ENDED: {datetime.utcnow().isoformat()}
             logger.error(f"Failed to save project '{project_name}': {e}")
             return None
 
+    def list_project_files(self, project_name: str) -> Optional[List[str]]:
+        """
+        List the files of a saved project, relative to its root.
+
+        Enumerated on demand rather than stored in the metadata, and cached
+        until the project is re-saved or deleted. The cache is keyed on the
+        project root's (inode, mtime_ns), so files changed inside subdirectories
+        by anything other than save_project are not noticed.
+
+        Returns:
+            List of relative file paths, or None if the project doesn't exist
+        """
+        project_path = self.PROJECTS_DIR / project_name
+        try:
+            validate_path_in_workspace(self.PROJECTS_DIR, project_path)
+            st = project_path.stat()
+        except (ValueError, OSError):
+            return None
+        stamp = (st.st_ino, st.st_mtime_ns)
+        cached = self._project_files_cache.get(project_name)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        files = [
+            f for f in _iter_relative_files(str(project_path))
+            if f != ".project_metadata.json"
+        ]
+        self._project_files_cache[project_name] = (stamp, files)
+        return files
+
     def _update_claude_md_with_context(
         self,
         workspace_dir: Path,
@@ -2078,32 +2716,62 @@ to understand what was being worked on. Continue from where the user left off,
 following their stated goals and next steps.
 """
 
+        section_bytes = session_context_section.encode("utf-8")
+        offset_path = workspace_dir / SESSION_CONTEXT_OFFSET_FILE
+
         try:
             if claude_md_path.exists():
-                # Append to existing CLAUDE.md
-                existing_content = claude_md_path.read_text()
-
-                # Remove any previous session context section (to avoid duplicates)
-                marker = "## 📋 SAVED SESSION CONTEXT"
-                if marker in existing_content:
-                    # Find and remove old context section
-                    idx = existing_content.find(marker)
-                    # Find the separator before the section
-                    sep_idx = existing_content.rfind("---", 0, idx)
-                    if sep_idx > 0:
-                        existing_content = existing_content[:sep_idx].rstrip()
-
-                # Append new context
-                claude_md_path.write_text(existing_content + session_context_section)
+                offset = self._saved_context_offset(claude_md_path, offset_path)
+                if offset is not None:
+                    # Replace the previous context section in place - no full read/rewrite
+                    with open(claude_md_path, "r+b") as f:
+                        f.seek(offset)
+                        f.truncate()
+                        f.write(section_bytes)
+                else:
+                    # Append to existing CLAUDE.md
+                    existing_content = claude_md_path.read_text()
+
+                    # Remove any previous session context section (separator included)
+                    # to avoid duplicates - one regex pass
+                    match = SESSION_CONTEXT_RE.search(existing_content)
+                    if match and match.start() > 0:
+                        existing_content = existing_content[:match.start()].rstrip()
+
+                    # Append new context
+                    existing_bytes = existing_content.encode("utf-8")
+                    write_file_bytes(claude_md_path, existing_bytes + section_bytes)
+                    offset = len(existing_bytes)
             else:
                 # Create new CLAUDE.md with just the context
-                claude_md_path.write_text(f"# Project: {project_name}\n" + session_context_section)
+                header_bytes = f"# Project: {project_name}\n".encode("utf-8")
+                write_file_bytes(claude_md_path, header_bytes + section_bytes)
+                offset = len(header_bytes)
 
+            offset_path.write_text(str(offset))
             logger.info(f"Updated CLAUDE.md with session context for {project_name}")
 
         except Exception as e:
             logger.error(f"Failed to update CLAUDE.md: {e}")
 
+    @staticmethod
+    def _saved_context_offset(claude_md_path: Path, offset_path: Path) -> Optional[int]:
+        """
+        Byte offset of the saved-session context section in CLAUDE.md, if known.
+
+        The offset from the sidecar is only trusted if the section prefix is
+        actually there (CLAUDE.md may have been edited or re-rendered since).
+        """
+        try:
+            offset = int(offset_path.read_text())
+            with open(claude_md_path, "rb") as f:
+                f.seek(offset)
+                if f.read(len(SESSION_CONTEXT_PREFIX)) == SESSION_CONTEXT_PREFIX:
+                    return offset
+        except (OSError, ValueError):
+            pass
+        return None
+
     def list_saved_projects(self, email: str = "") -> list:
         """
         List saved projects, optionally filtered by email.
@@ -2117,18 +2785,34 @@ following their stated goals and next steps.
         projects = []
         email_filter = email.lower() if email else ""
 
-        if not self.PROJECTS_DIR.exists():
+        if not os.path.isdir(self._projects_dir_str):
             return projects
 
-        for project_dir in self.PROJECTS_DIR.iterdir():
-            if not project_dir.is_dir():
-                continue
+        with os.scandir(self._projects_dir_str) as entries:
+            project_entries = [
+                entry for entry in entries
+                if entry.is_dir() and not entry.name.startswith(PROJECT_TRASH_PREFIX)
+            ]
 
-            metadata_path = project_dir / ".project_metadata.json"
-            if metadata_path.exists():
+        for entry in project_entries:
+            metadata_path = os.path.join(entry.path, ".project_metadata.json")
+            try:
+                metadata_mtime = os.stat(metadata_path).st_mtime_ns
+            except OSError:
+                metadata_mtime = None
+            if metadata_mtime is not None:
                 try:
-                    metadata = json.loads(metadata_path.read_text())
-                    metadata["path"] = str(project_dir)
+                    # Parsed metadata is reused until the file changes
+                    cached = self._project_meta_cache.get(metadata_path)
+                    if cached and cached[0] == metadata_mtime:
+                        metadata = dict(cached[1])
+                    else:
+                        # Older saves still embed a "files" list; it is returned as stored
+                        with open(metadata_path, "rb") as f:
+                            metadata = _load_json_bytes(f.read())
+                        metadata["path"] = entry.path
+                        self._project_meta_cache[metadata_path] = (metadata_mtime, metadata)
+                        metadata = dict(metadata)
 
                     # Filter by email if specified
                     if email_filter:
@@ -2138,21 +2822,21 @@ following their stated goals and next steps.
 
                     projects.append(metadata)
                 except Exception as e:
-                    logger.warning(f"Failed to read metadata for {project_dir}: {e}")
+                    logger.warning(f"Failed to read metadata for {entry.path}: {e}")
                     # Only include projects without metadata if no email filter
                     if not email_filter:
                         projects.append({
-                            "name": project_dir.name,
-                            "path": str(project_dir),
-                            "saved_at": datetime.fromtimestamp(project_dir.stat().st_mtime).isoformat()
+                            "name": entry.name,
+                            "path": entry.path,
+                            "saved_at": datetime.fromtimestamp(entry.stat().st_mtime).isoformat()
                         })
             else:
                 # Project without metadata file - only include if no email filter
                 if not email_filter:
                     projects.append({
-                        "name": project_dir.name,
-                        "path": str(project_dir),
-                        "saved_at": datetime.fromtimestamp(project_dir.stat().st_mtime).isoformat()
+                        "name": entry.name,
+                        "path": entry.path,
+                        "saved_at": datetime.fromtimestamp(entry.stat().st_mtime).isoformat()
                     })
 
         # Sort by saved_at descending
@@ -2182,7 +2866,7 @@ following their stated goals and next steps.
             metadata_path = project_path / ".project_metadata.json"
             if metadata_path.exists() and not email:
                 try:
-                    metadata = json.loads(metadata_path.read_text())
+                    metadata = _load_json_bytes(metadata_path.read_bytes())
                     email = metadata.get("email", "")
                 except Exception:
                     pass
@@ -2194,7 +2878,8 @@ following their stated goals and next steps.
             shutil.copytree(
                 project_path,
                 workspace,
-                ignore=shutil.ignore_patterns('.project_metadata.json', '.claude_history')
+                ignore=_ignore_for_restore,
+                copy_function=_fast_copy
             )
 
             # Restore conversation history if saved
@@ -2207,21 +2892,17 @@ following their stated goals and next steps.
                 uploaded_files = [f.name for f in data_dir.iterdir() if f.is_file()]
 
             # Build uploaded files section
-            uploaded_files_section = ""
-            if uploaded_files:
-                file_list = "\n".join([f"| `{f}` | `data/{f}` |" for f in uploaded_files])
-                uploaded_files_section = UPLOADED_FILES_SECTION.format(file_list=file_list)
+            uploaded_files_section = build_uploaded_files_section(uploaded_files)
 
             # Update CLAUDE.md with new session info
             claude_md_path = workspace / "CLAUDE.md"
-            claude_md_content = CLAUDE_MD_TEMPLATE.format(
+            claude_md_content = render_claude_md(
                 session_id=ccresearch_id,
-                email=email or "Not provided",
-                created_at=datetime.utcnow().isoformat(),
+                email=email,
                 workspace_dir=str(workspace),
                 uploaded_files_section=uploaded_files_section
             )
-            claude_md_path.write_text(claude_md_content)
+            write_file_bytes(claude_md_path, claude_md_content)
 
             # Create isolated .claude directory
             self._setup_claude_config(workspace)
@@ -2238,61 +2919,66 @@ following their stated goals and next steps.
         claude_dir = workspace / ".claude"
         claude_dir.mkdir(parents=True, exist_ok=True)
 
-        global_claude = Path.home() / ".claude"
+        global_claude = self.GLOBAL_CLAUDE_DIR
+        present = self._global_claude_entries()
 
-        # 1. Copy settings.json (main config with enabled plugins)
-        global_settings = global_claude / "settings.json"
-        if global_settings.exists():
-            shutil.copy(global_settings, claude_dir / "settings.json")
+        # settings.json (main config with enabled plugins), .credentials.json (API keys)
+        for name, mode in CLAUDE_CONFIG_COPIES:
+            if name in present:
+                _copy_config_file(global_claude / name, claude_dir / name, mode)
 
-        # 2. Symlink plugins directory (contains installed plugins and marketplaces)
-        global_plugins = global_claude / "plugins"
-        session_plugins = claude_dir / "plugins"
-        if global_plugins.exists() and not session_plugins.exists():
-            try:
-                session_plugins.symlink_to(global_plugins)
-            except OSError:
-                pass
+        # Symlinks are a single syscall each: plugins (installed plugins and
+        # marketplaces), skills (custom user skills), statsig (feature flags),
+        # cache (plugin caches). An existing link is left alone.
+        for name in CLAUDE_CONFIG_SYMLINKS:
+            if name in present:
+                try:
+                    os.symlink(global_claude / name, claude_dir / name)
+                except OSError:
+                    pass
 
-        # 3. Symlink skills directory (custom user skills)
-        global_skills = global_claude / "skills"
-        session_skills = claude_dir / "skills"
-        if global_skills.exists() and not session_skills.exists():
-            try:
-                session_skills.symlink_to(global_skills)
-            except OSError:
-                pass
+        # Write settings.local.json with session-specific permissions
+        write_file_bytes(claude_dir / "settings.local.json", self._merged_settings_local_bytes())
 
-        # 4. Copy credentials (hidden file with API keys)
-        global_credentials = global_claude / ".credentials.json"
-        if global_credentials.exists():
-            shutil.copy(global_credentials, claude_dir / ".credentials.json")
+    def _global_claude_entries(self) -> frozenset:
+        """
+        Names present in the global ~/.claude directory.
 
-        # 5. Symlink statsig directory (feature flags)
-        global_statsig = global_claude / "statsig"
-        session_statsig = claude_dir / "statsig"
-        if global_statsig.exists() and not session_statsig.exists():
+        Discovered with one readdir on first use and reused for every new
+        workspace; call refresh_global_claude() after changing the global config.
+        """
+        if self._global_claude_present is None:
             try:
-                session_statsig.symlink_to(global_statsig)
+                with os.scandir(self.GLOBAL_CLAUDE_DIR) as entries:
+                    self._global_claude_present = frozenset(entry.name for entry in entries)
             except OSError:
-                pass
+                return frozenset()  # Not set up yet - look again next time
+        return self._global_claude_present
 
-        # 6. Symlink cache directory (plugin caches)
-        global_cache = global_claude / "cache"
-        session_cache = claude_dir / "cache"
-        if global_cache.exists() and not session_cache.exists():
-            try:
-                session_cache.symlink_to(global_cache)
-            except OSError:
-                pass
+    def refresh_global_claude(self) -> List[str]:
+        """Forget the cached ~/.claude layout and rediscover it."""
+        self._global_claude_present = None
+        return sorted(self._global_claude_entries())
 
-        # 7. Write settings.local.json with session-specific permissions
-        # Merge global settings.local.json (if exists) with our permissions template
-        settings_local_path = claude_dir / "settings.local.json"
-        global_settings_local = global_claude / "settings.local.json"
+    def _merged_settings_local_bytes(self) -> bytes:
+        """
+        Global ~/.claude/settings.local.json merged with our permissions template,
+        serialized to bytes.
+
+        The result only changes when the global file does, so it is cached
+        against that file's (mtime, size) instead of re-merging per workspace.
+        """
+        global_settings_local = self.GLOBAL_CLAUDE_DIR / "settings.local.json"
+        try:
+            st = global_settings_local.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        if self._merged_settings_cache is not None and self._merged_settings_cache[0] == stamp:
+            return self._merged_settings_cache[1]
 
         merged_settings = {}
-        if global_settings_local.exists():
+        if stamp is not None:
             try:
                 merged_settings = json.loads(global_settings_local.read_text())
             except json.JSONDecodeError:
@@ -2300,15 +2986,21 @@ following their stated goals and next steps.
 
         existing_allow = merged_settings.get("permissions", {}).get("allow", [])
         template_allow = CCRESEARCH_PERMISSIONS_TEMPLATE["permissions"]["allow"]
-        combined_allow = list(set(existing_allow + template_allow))
+        # Never let a global allow rule re-open something the template denies
+        combined_allow = [rule for rule in set(existing_allow + template_allow) if not is_denied(rule)]
         merged_settings["permissions"] = {"allow": combined_allow}
 
-        settings_local_path.write_text(json.dumps(merged_settings, indent=2))
+        data = _dump_json_bytes(merged_settings)
+        self._merged_settings_cache = (stamp, data)
+        return data
 
-    def delete_project(self, project_name: str) -> bool:
+    async def delete_project(self, project_name: str) -> bool:
         """
         Delete a saved project.
 
+        Like delete_workspace, the project is renamed aside at once and its
+        tree is removed in the background.
+
         Args:
             project_name: Name of project to delete
 
@@ -2325,7 +3017,9 @@ following their stated goals and next steps.
                 except ValueError:
                     logger.error(f"Blocked project deletion outside PROJECTS_DIR: {project_path}")
                     return False
-                shutil.rmtree(project_path)
+                self._discard_tree(project_path, f"{PROJECT_TRASH_PREFIX}{uuid.uuid4().hex[:8]}-{project_name}")
+                self._project_files_cache.pop(project_name, None)
+                self._project_meta_cache.pop(os.path.join(self._projects_dir_str, project_name, ".project_metadata.json"), None)
                 logger.info(f"Deleted project: {project_name}")
                 return True
             return False
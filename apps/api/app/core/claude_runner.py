@@ -20,10 +20,67 @@ from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from app.core.config import settings
 
+# stream-json events are parsed with orjson when available (C parser, takes bytes
+# directly), stdlib otherwise. orjson.JSONDecodeError subclasses json.JSONDecodeError.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+STDOUT_READ_SIZE = 64 * 1024  # Bytes per stdout read from the claude process
+STREAM_READER_LIMIT = 1 << 20  # StreamReader buffer limit (default 64 KiB is tight for large events)
+
+# Project permissions are identical for every project; serialize them once
+PROJECT_SETTINGS_JSON_BYTES = json.dumps({
+    "permissions": {
+        "allow": [
+            "Bash(source ~/.local/share/data-studio-venv/bin/activate*)",
+            "Bash(python*)",
+            "Bash(pip*)",
+            "Read(*)",
+            "Write(.analysis/*)",
+            "Write(.dashboards/*)",
+            "Write(output/*)"
+        ]
+    }
+}, indent=2).encode("utf-8")
+
+
+def _headless_assistant(event: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Claude's response: text blocks and tool calls."""
+    out = []
+    for block in event.get('message', {}).get('content', []):
+        block_type = block.get('type')
+        if block_type == 'text':
+            out.append({"type": "text", "content": block.get('text', '')})
+        elif block_type == 'tool_use':
+            out.append({"type": "tool", "content": f"Using: {block.get('name', '')}"})
+    return out
+
+
+def _headless_result(event: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Final result."""
+    return [{"type": "result", "content": event.get('result', '')}]
+
+
+def _headless_error(event: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Error reported by the CLI."""
+    return [{"type": "error", "content": event.get('error', {}).get('message', 'Unknown error')}]
 
-@dataclass
+
+# stream-json event type -> headless-mode events to emit; other types are dropped
+_HEADLESS_HANDLERS = {
+    'assistant': _headless_assistant,
+    'result': _headless_result,
+    'error': _headless_error,
+}
+
+
+@dataclass(slots=True)
 class ClaudeSession:
     """Represents a Claude Code session."""
     session_id: str
@@ -46,6 +103,8 @@ class ClaudeRunner:
     def __init__(self):
         self.sessions: Dict[str, ClaudeSession] = {}
         self.venv_path = os.path.expanduser("~/.local/share/data-studio-venv")
+        # Project dirs whose directories, CLAUDE.md and settings were written this run
+        self._materialized_projects: set = set()
 
     def get_session_id(self, user_id: str, project_name: str) -> str:
         """Generate deterministic session ID from user and project."""
@@ -91,32 +150,28 @@ Available: pandas, numpy, plotly, kaleido, openpyxl, xlrd, pyarrow
 
     def _ensure_project_structure(self, project_dir: str, project_name: str):
         """Ensure project has required directories and CLAUDE.md."""
+        # Already set up by this process; one stat guards against the project
+        # having been deleted and recreated since
+        if project_dir in self._materialized_projects and os.path.exists(
+            os.path.join(project_dir, '.claude', 'CLAUDE.md')
+        ):
+            return
+
         # Create directories
         for subdir in ['data', '.analysis', '.dashboards', 'output/charts', '.claude']:
             os.makedirs(os.path.join(project_dir, subdir), exist_ok=True)
 
         # Create/update CLAUDE.md
         claude_md_path = os.path.join(project_dir, '.claude', 'CLAUDE.md')
-        with open(claude_md_path, 'w') as f:
-            f.write(self._get_project_claude_md(project_dir, project_name))
+        with open(claude_md_path, 'wb') as f:
+            f.write(self._get_project_claude_md(project_dir, project_name).encode('utf-8'))
 
         # Create settings.local.json for permissions
         settings_path = os.path.join(project_dir, '.claude', 'settings.local.json')
-        settings = {
-            "permissions": {
-                "allow": [
-                    "Bash(source ~/.local/share/data-studio-venv/bin/activate*)",
-                    "Bash(python*)",
-                    "Bash(pip*)",
-                    "Read(*)",
-                    "Write(.analysis/*)",
-                    "Write(.dashboards/*)",
-                    "Write(output/*)"
-                ]
-            }
-        }
-        with open(settings_path, 'w') as f:
-            json.dump(settings, f, indent=2)
+        with open(settings_path, 'wb') as f:
+            f.write(PROJECT_SETTINGS_JSON_BYTES)
+
+        self._materialized_projects.add(project_dir)
 
     async def run_analysis(
         self,
@@ -429,6 +484,7 @@ If asked to create a visualization, output a Plotly JSON specification."""
                 cwd=project_dir,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                limit=STREAM_READER_LIMIT,
                 env={**os.environ, "TERM": "dumb",
                      **({"OPENAI_API_KEY": settings.OPENAI_API_KEY} if settings.OPENAI_API_KEY else {}),
                      **({"TAVILY_API_KEY": settings.TAVILY_API_KEY} if settings.TAVILY_API_KEY else {})}
@@ -445,24 +501,30 @@ If asked to create a visualization, output a Plotly JSON specification."""
 
             yield {"type": "status", "content": "Session started, processing..."}
 
-            # Stream stdout
-            buffer = ""
+            # Stream stdout (kept as bytes; JSON lines are parsed without decoding first).
+            # Large reads into one growing buffer, framed by newline offsets, so a burst of
+            # small stream-json events costs one await instead of one per event.
+            buffer = bytearray()
             while True:
-                chunk = await process.stdout.read(4096)
+                chunk = await process.stdout.read(STDOUT_READ_SIZE)
                 if not chunk:
                     break
 
-                buffer += chunk.decode('utf-8', errors='replace')
+                buffer += chunk
 
                 # Process complete JSON lines
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    line = line.strip()
+                start = 0
+                while True:
+                    newline = buffer.find(b'\n', start)
+                    if newline == -1:
+                        break
+                    line = bytes(buffer[start:newline]).strip()
+                    start = newline + 1
                     if not line:
                         continue
 
                     try:
-                        event = json.loads(line)
+                        event = _json_loads(line)
                         event_type = event.get('type', 'unknown')
 
                         if mode == "terminal":
@@ -470,28 +532,18 @@ If asked to create a visualization, output a Plotly JSON specification."""
                             yield {"type": event_type, "content": event}
                         else:
                             # Headless mode: filter to important events
-                            if event_type == 'assistant':
-                                # Claude's response
-                                message = event.get('message', {})
-                                content = message.get('content', [])
-                                for block in content:
-                                    if block.get('type') == 'text':
-                                        yield {"type": "text", "content": block.get('text', '')}
-                                    elif block.get('type') == 'tool_use':
-                                        tool_name = block.get('name', '')
-                                        yield {"type": "tool", "content": f"Using: {tool_name}"}
-
-                            elif event_type == 'result':
-                                # Final result
-                                yield {"type": "result", "content": event.get('result', '')}
-
-                            elif event_type == 'error':
-                                yield {"type": "error", "content": event.get('error', {}).get('message', 'Unknown error')}
-
-                    except json.JSONDecodeError:
+                            handler = _HEADLESS_HANDLERS.get(event_type)
+                            if handler:
+                                for out in handler(event):
+                                    yield out
+
+                    except (json.JSONDecodeError, UnicodeDecodeError):
                         # Not JSON, might be raw output
                         if mode == "terminal":
-                            yield {"type": "raw", "content": line}
+                            yield {"type": "raw", "content": line.decode('utf-8', errors='replace')}
+
+                # Drop the consumed lines, keeping any partial trailing line
+                del buffer[:start]
 
             # Wait for process to complete
             await process.wait()
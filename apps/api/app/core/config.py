@@ -113,10 +113,17 @@ class Settings(BaseSettings):
     TRIAL_DURATION_HOURS: int = 24  # How long new user trials last
     MAX_UPLOAD_SIZE_MB: int = 50  # Max upload size for remote requests (MB)
 
+    # Public API rate limiting (outbound Claude requests, shared across all callers)
+    PUBLIC_API_CLAUDE_RPM: int = 50  # Requests per minute (must be > 0)
+    PUBLIC_API_CLAUDE_BURST: int = 10  # Requests allowed back-to-back before throttling (>= 1)
+    PUBLIC_API_CLAUDE_MAX_RETRIES: int = 4  # SDK retries on 429/5xx/connection errors (backoff + jitter)
+    PUBLIC_API_OPENAI_MAX_RETRIES: int = 4  # Same, for the OpenAI client
+
     # CCResearch resource limits (per session)
-    CCRESEARCH_MEMORY_LIMIT_MB: int = 6000  # Virtual address space limit
-    CCRESEARCH_MAX_PROCESSES: int = 150  # Max child processes per session
+    CCRESEARCH_MEMORY_LIMIT_MB: int = 6000  # Heap/anonymous memory limit (RLIMIT_DATA)
+    CCRESEARCH_MAX_PROCESSES: int = 150  # Not applied: RLIMIT_NPROC is per user, not per session
     CCRESEARCH_MAX_OPEN_FILES: int = 2048  # Max open file descriptors
+    CCRESEARCH_MAX_CONCURRENT_SPAWNS: int = 8  # Session process spawns allowed in parallel (server-wide)
 
     class Config:
         env_file = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".env")
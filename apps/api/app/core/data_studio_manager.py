@@ -6,6 +6,7 @@ Each message spawns a new claude process but uses persistent session IDs.
 """
 
 import asyncio
+import codecs
 import hashlib
 import json
 import logging
@@ -45,6 +46,8 @@ class DataStudioManager:
 
     def __init__(self):
         self.sessions: Dict[str, DataStudioSession] = {}
+        # Secondary index: user_id -> {session_id: session}, kept in step with self.sessions
+        self._sessions_by_user: Dict[str, Dict[str, DataStudioSession]] = {}
 
     def _get_project_dir(self, user_id: str, project_name: str) -> str:
         """Get the project directory path."""
@@ -186,7 +189,11 @@ flowchart TD
 - **ALWAYS write your response to `.data-studio/response.md`**
 - Always use `"template": "plotly_dark"` for Plotly charts (dark theme)
 - Keep chart heights around 300-400px for good display
-- For large datasets, aggregate or sample before charting
+- For large datasets, aggregate or sample before charting; embed only the reduced data:
+  - Bar: group by the x column and sum/mean y first (one point per category)
+  - Pie: at most 30 slices (top categories, rest as "Other")
+  - Scatter/histogram: sample down to at most 50,000 points
+  - Heatmap: at most 100 x 100 cells (top categories on each axis)
 - When showing tables, limit to 20 rows unless asked for more
 - Always explain what the visualization shows in plain language
 '''
@@ -283,7 +290,11 @@ flowchart TD
             claude_session_id=claude_session_id,
         )
 
+        previous = self.sessions.get(session_id)
+        if previous is not None:
+            self._sessions_by_user.get(previous.user_id, {}).pop(session_id, None)
         self.sessions[session_id] = session
+        self._sessions_by_user.setdefault(user_id, {})[session_id] = session
         logger.info(f"Created Data Studio session {session_id} for project {project_name}")
         logger.info(f"Claude session ID: {claude_session_id}")
 
@@ -365,21 +376,29 @@ flowchart TD
             )
             session.active_process = process
 
-            # Read all output at once (simpler and more reliable)
-            full_output = ""
+            # Accumulate chunks in a list and join once at the end. The incremental
+            # decoder holds back a multi-byte character split across two reads.
+            output_parts: List[str] = []
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
             if process.stdout:
                 while True:
                     try:
                         chunk = await asyncio.wait_for(
-                            process.stdout.read(4096),
+                            process.stdout.read(65536),
                             timeout=120.0
                         )
                         if not chunk:
+                            tail = decoder.decode(b"", final=True)
+                            if tail:
+                                output_parts.append(tail)
+                                yield {"type": "text_delta", "content": tail}
                             break  # EOF
 
                         # Decode and accumulate
-                        text = chunk.decode()
-                        full_output += text
+                        text = decoder.decode(chunk)
+                        if not text:
+                            continue
+                        output_parts.append(text)
 
                         # Send incremental updates (every chunk)
                         yield {"type": "text_delta", "content": text}
@@ -407,6 +426,7 @@ flowchart TD
                     yield {"type": "error", "message": error_msg[:500]}
 
             # Send final complete response
+            full_output = "".join(output_parts)
             if full_output.strip():
                 logger.info(f"Claude response: {len(full_output)} chars")
                 yield {"type": "result", "content": full_output.strip()}
@@ -448,6 +468,11 @@ flowchart TD
 
         session.is_active = False
         del self.sessions[session_id]
+        user_sessions = self._sessions_by_user.get(session.user_id)
+        if user_sessions is not None:
+            user_sessions.pop(session_id, None)
+            if not user_sessions:
+                del self._sessions_by_user[session.user_id]
         logger.info(f"Closed Data Studio session {session_id}")
         return True
 
@@ -465,8 +490,7 @@ flowchart TD
                 "last_activity": s.last_activity.isoformat(),
                 "is_active": s.is_active
             }
-            for s in self.sessions.values()
-            if s.user_id == user_id
+            for s in self._sessions_by_user.get(user_id, {}).values()
         ]
 
 
@@ -180,9 +180,8 @@ class ProjectManager:
         await aiofiles.os.makedirs(claude_dir, exist_ok=True)
 
         # Write Claude settings.local.json with project permissions
-        settings_content = self._get_claude_settings()
         async with aiofiles.open(claude_dir / "settings.local.json", 'w') as f:
-            await f.write(json.dumps(settings_content, indent=2))
+            await f.write(CLAUDE_SETTINGS_JSON)
 
         # Create project metadata
         now = datetime.utcnow().isoformat()
@@ -361,7 +360,8 @@ class ProjectManager:
         async with aiofiles.open(meta_path, 'w') as f:
             await f.write(json.dumps(meta, indent=2))
 
-    def _get_claude_settings(self) -> Dict[str, Any]:
+    @staticmethod
+    def _get_claude_settings() -> Dict[str, Any]:
         """Get Claude Code settings for project-level permissions.
 
         SECURITY: Comprehensive deny rules to prevent:
@@ -597,6 +597,10 @@ This workspace runs on an SSD via symlink mount (`/data` → external SSD).
             await f.write(content)
 
 
+# Project settings.local.json is the same for every project; serialize it once
+CLAUDE_SETTINGS_JSON = json.dumps(ProjectManager._get_claude_settings(), indent=2)
+
+
 def get_project_manager(user_id: str) -> ProjectManager:
     """Factory function to get a ProjectManager for a user."""
     return ProjectManager(user_id)
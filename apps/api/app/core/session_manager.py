@@ -25,9 +25,23 @@ from typing import Optional, List, Dict, Any
 
 from app.core.config import settings
 
+# .session.json is rewritten on every touch; use orjson when available (C encoder,
+# produces bytes directly), stdlib otherwise.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("session_manager")
 
 
+def _dump_metadata_bytes(data: Dict[str, Any]) -> bytes:
+    """Serialize session metadata as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
 async def get_user_id_from_email(email: str) -> Optional[str]:
     """
     Look up user_id from email address.
@@ -100,6 +114,8 @@ SESSION_PERMISSIONS = {
     "hasClaudeMdExternalIncludesApproved": False,
     "hasClaudeMdExternalIncludesWarningShown": True
 }
+# Serialized once; every new session writes the same settings.local.json
+SESSION_PERMISSIONS_JSON_BYTES = json.dumps(SESSION_PERMISSIONS, indent=2).encode("utf-8")
 
 
 # Session metadata schema
@@ -208,9 +224,7 @@ class SessionManager:
         # Create .claude directory with permissions
         claude_dir = session_dir / ".claude"
         claude_dir.mkdir(exist_ok=True)
-        (claude_dir / "settings.local.json").write_text(
-            json.dumps(SESSION_PERMISSIONS, indent=2)
-        )
+        (claude_dir / "settings.local.json").write_bytes(SESSION_PERMISSIONS_JSON_BYTES)
 
         # Create metadata
         now = datetime.utcnow().isoformat()
@@ -413,7 +427,8 @@ class SessionManager:
             return self._create_legacy_metadata(session_dir)
 
         try:
-            data = json.loads(metadata_path.read_text())
+            raw = metadata_path.read_bytes()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             return SessionMetadata.from_dict(data)
         except Exception as e:
             logger.warning(f"Error reading metadata from {metadata_path}: {e}")
@@ -422,7 +437,7 @@ class SessionManager:
     def _write_metadata(self, session_dir: Path, metadata: SessionMetadata):
         """Write metadata to .session.json"""
         metadata_path = session_dir / ".session.json"
-        metadata_path.write_text(json.dumps(metadata.to_dict(), indent=2))
+        metadata_path.write_bytes(_dump_metadata_bytes(metadata.to_dict()))
 
     def _create_legacy_metadata(self, session_dir: Path) -> Optional[SessionMetadata]:
         """Create metadata for legacy sessions without .session.json"""
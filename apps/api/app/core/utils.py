@@ -6,6 +6,7 @@ Contains common helpers used across multiple core managers.
 
 import uuid
 import unicodedata
+from typing import Optional
 
 
 # Reserved names that cannot be used as project/file names (case-insensitive).
@@ -18,6 +19,22 @@ RESERVED_NAMES = {
 
 MAX_NAME_LENGTH = 100
 
+# Magic-byte signatures for raster image formats.
+# WebP is RIFF-framed and needs a second check at offset 8 (see detect_image_mime).
+IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+IMAGE_EXTENSIONS = {
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+}
+
 
 def sanitize_name(name: str, allow_dots: bool = False) -> str:
     """Sanitize a name for use as a directory or file name.
@@ -48,3 +65,17 @@ def sanitize_name(name: str, allow_dots: bool = False) -> str:
     if not safe or safe.lower() in RESERVED_NAMES:
         safe = f"project-{uuid.uuid4().hex[:8]}"
     return safe
+
+
+def detect_image_mime(data: bytes) -> Optional[str]:
+    """Detect a raster image's MIME type from its leading bytes.
+
+    Args:
+        data: The file content (only the first 12 bytes are inspected).
+
+    Returns:
+        The MIME type, or None if the content is not a recognized image.
+    """
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    return next((mime for sig, mime in IMAGE_SIGNATURES if data.startswith(sig)), None)
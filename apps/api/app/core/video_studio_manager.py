@@ -27,7 +27,7 @@ logger = logging.getLogger(__name__)
 TEMPLATE_DIR = Path(settings.DATA_BASE_DIR) / "video-studio-template"
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessInfo:
     """Container for PTY process and its read task."""
     process: pexpect.spawn
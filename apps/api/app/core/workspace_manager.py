@@ -17,7 +17,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from .config import settings
-from .utils import sanitize_name as _shared_sanitize_name
+from .utils import sanitize_name as _shared_sanitize_name, detect_image_mime, IMAGE_EXTENSIONS
 import aiofiles
 import aiofiles.os
 
@@ -486,10 +486,14 @@ class WorkspaceManager:
         images_path = self._get_project_path(project_name) / "images"
         await aiofiles.os.makedirs(images_path, exist_ok=True)
 
-        # Generate unique filename with extension
+        # Generate unique filename with extension; when the content is a
+        # recognized image, trust it over the client-supplied name
         ext = Path(original_filename).suffix.lower() or '.png'
         if ext not in ['.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg']:
             ext = '.png'
+        detected = detect_image_mime(file_content)
+        if detected and not (detected == 'image/jpeg' and ext == '.jpeg'):
+            ext = IMAGE_EXTENSIONS[detected]
         image_id = uuid.uuid4().hex
         filename = f"{image_id}{ext}"
 
@@ -360,6 +360,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error shutting down chat manager: {e}")
 
+    # Cleanup: close the public API's shared HTTP connection pool
+    try:
+        from app.routers.public_api import close_http_client
+        await close_http_client()
+    except Exception as e:
+        logger.error(f"Error closing public API HTTP client: {e}")
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
@@ -50,7 +50,8 @@ from app.core.ccresearch_manager import ccresearch_manager, _validate_session_id
 from app.core.session_manager import session_manager, get_user_id_from_email
 from app.core.project_manager import get_project_manager
 from app.core.notifications import notify_access_request, notify_plugin_skill_request
-from app.models.models import CCResearchSession
+from app.core.user_access import require_admin
+from app.models.models import CCResearchSession, User
 from collections import defaultdict
 import time
 
@@ -82,6 +83,11 @@ upload_rate_limiter = RateLimiter(requests_per_minute=10)  # 10 uploads per minu
 logger = logging.getLogger("ccresearch")
 router = APIRouter()
 
+# Terminal WebSocket activity (command counter, last activity, terminal size) is
+# committed at most this often; anything pending is flushed when the socket closes,
+# including on errors (best effort)
+SESSION_COMMIT_INTERVAL_SECONDS = 5.0
+
 # Path to allowed emails whitelist (protected from Claude Code via deny rules)
 ALLOWED_EMAILS_FILE = Path.home() / ".ccresearch_allowed_emails.json"
 
@@ -285,7 +291,7 @@ async def ensure_project_claude_setup(
         email: User's email
         force: If True, overwrite existing CLAUDE.md (use for new projects)
     """
-    from app.core.ccresearch_manager import CLAUDE_MD_TEMPLATE, CCRESEARCH_PERMISSIONS_TEMPLATE
+    from app.core.ccresearch_manager import render_claude_md, write_file_bytes, CCRESEARCH_PERMISSIONS_JSON_BYTES
     
     # Ensure .claude directory exists
     claude_dir = workspace_dir / ".claude"
@@ -296,20 +302,18 @@ async def ensure_project_claude_setup(
     should_write_claude_md = force or not claude_md_path.exists() or claude_md_path.stat().st_size == 0
     
     if should_write_claude_md:
-        claude_md_content = CLAUDE_MD_TEMPLATE.format(
+        claude_md_content = render_claude_md(
             session_id=session_id,
-            email=email or "Not provided",
-            created_at=datetime.utcnow().isoformat(),
-            workspace_dir=str(workspace_dir),
-            uploaded_files_section=""
+            email=email,
+            workspace_dir=str(workspace_dir)
         )
-        claude_md_path.write_text(claude_md_content)
+        write_file_bytes(claude_md_path, claude_md_content)
         logger.info(f"{'Overwrote' if force else 'Created'} CLAUDE.md for project at {workspace_dir}")
     
     # Always ensure settings.local.json exists with security rules
     settings_local_path = claude_dir / "settings.local.json"
     if force or not settings_local_path.exists():
-        settings_local_path.write_text(json.dumps(CCRESEARCH_PERMISSIONS_TEMPLATE, indent=2))
+        write_file_bytes(settings_local_path, CCRESEARCH_PERMISSIONS_JSON_BYTES)
         logger.info(f"{'Overwrote' if force else 'Created'} .claude/settings.local.json for project at {workspace_dir}")
 
 
@@ -456,20 +460,18 @@ Files created here will appear in the Workspace Files tab.
         logger.info(f"Created unified session {ccresearch_id} for user {user_id} at {workspace_dir}")
 
         # Override with CCResearch-specific CLAUDE.md and permissions
-        from app.core.ccresearch_manager import CLAUDE_MD_TEMPLATE, CCRESEARCH_PERMISSIONS_TEMPLATE
+        from app.core.ccresearch_manager import render_claude_md, write_file_bytes, CCRESEARCH_PERMISSIONS_JSON_BYTES
         claude_md_path = workspace_dir / "CLAUDE.md"
-        claude_md_content = CLAUDE_MD_TEMPLATE.format(
+        claude_md_content = render_claude_md(
             session_id=ccresearch_id,
-            email=email or "Not provided",
-            created_at=datetime.utcnow().isoformat(),
-            workspace_dir=str(workspace_dir),
-            uploaded_files_section=""
+            email=email,
+            workspace_dir=str(workspace_dir)
         )
-        claude_md_path.write_text(claude_md_content)
+        write_file_bytes(claude_md_path, claude_md_content)
 
         # Write CCResearch permissions with comprehensive deny rules
         settings_local_path = workspace_dir / ".claude" / "settings.local.json"
-        settings_local_path.write_text(json.dumps(CCRESEARCH_PERMISSIONS_TEMPLATE, indent=2))
+        write_file_bytes(settings_local_path, CCRESEARCH_PERMISSIONS_JSON_BYTES)
 
     # Fallback: Create workspace in default location (for users not in DB)
     else:
@@ -1489,7 +1491,7 @@ async def delete_session(
     await ccresearch_manager.terminate_session(ccresearch_id)
 
     # Delete workspace directory
-    ccresearch_manager.delete_workspace(Path(session.workspace_dir))
+    await ccresearch_manager.delete_workspace(Path(session.workspace_dir))
 
     # Delete from database
     await db.execute(
@@ -1885,7 +1887,7 @@ async def save_session_as_project(
         raise HTTPException(status_code=404, detail="Workspace not found")
 
     # Pass session email for project ownership
-    project_path = ccresearch_manager.save_project(
+    project_path = await ccresearch_manager.save_project(
         workspace,
         request.project_name,
         request.description or "",
@@ -2107,10 +2109,21 @@ async def create_session_from_project(
     )
 
 
+@router.get("/projects/{project_name}/files")
+async def list_project_files(project_name: str):
+    """List the files of a saved project (relative paths)"""
+    files = await asyncio.to_thread(ccresearch_manager.list_project_files, project_name)
+
+    if files is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    return {"name": project_name, "files": files}
+
+
 @router.delete("/projects/{project_name}")
 async def delete_project(project_name: str):
     """Delete a saved project from SSD"""
-    success = ccresearch_manager.delete_project(project_name)
+    success = await ccresearch_manager.delete_project(project_name)
 
     if not success:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -2595,6 +2608,13 @@ async def list_plugin_skill_requests():
         return {"requests": []}
 
 
+@router.post("/admin/refresh-claude-config")
+async def refresh_claude_config(admin: User = Depends(require_admin)):
+    """Rediscover the global ~/.claude layout after it changes (admin only)."""
+    entries = ccresearch_manager.refresh_global_claude()
+    return {"status": "refreshed", "entries": entries}
+
+
 # ============ Session Monitoring Endpoints ============
 
 @router.get("/sessions/{ccresearch_id}/log")
@@ -3170,6 +3190,7 @@ async def terminal_websocket(
 
     # Get database session
     async for db in get_db():
+        uncommitted = False  # Session changes not yet committed (see SESSION_COMMIT_INTERVAL_SECONDS)
         try:
             # Validate session exists
             result = await db.execute(
@@ -3329,9 +3350,11 @@ async def terminal_websocket(
             )
 
             # Main message loop
+            last_commit = time.monotonic()
             try:
                 while True:
                     message = await websocket.receive()
+                    dirty = False
 
                     if "bytes" in message:
                         # Raw input -> Claude stdin
@@ -3341,6 +3364,7 @@ async def terminal_websocket(
                         )
                         session.commands_executed += 1
                         session.last_activity_at = datetime.utcnow()
+                        dirty = True
 
                     elif "text" in message:
                         # JSON command
@@ -3355,6 +3379,7 @@ async def terminal_websocket(
                                 )
                                 session.terminal_rows = rows
                                 session.terminal_cols = cols
+                                dirty = True
 
                             elif data.get("type") == "ping":
                                 await websocket.send_json({"type": "pong"})
@@ -3362,7 +3387,13 @@ async def terminal_websocket(
                         except json.JSONDecodeError:
                             logger.warning(f"Invalid JSON received: {message['text'][:100]}")
 
-                    await db.commit()
+                    # Coalesce per-keystroke updates instead of committing each one
+                    if dirty:
+                        uncommitted = True
+                    if uncommitted and time.monotonic() - last_commit >= SESSION_COMMIT_INTERVAL_SECONDS:
+                        await db.commit()
+                        last_commit = time.monotonic()
+                        uncommitted = False
 
             except WebSocketDisconnect:
                 logger.info(f"WebSocket disconnected: {ccresearch_id}")
@@ -3390,6 +3421,7 @@ async def terminal_websocket(
             # Don't terminate process on disconnect - allow reconnect
             session.status = "disconnected"
             await db.commit()
+            uncommitted = False
 
         except Exception as e:
             logger.error(f"Session error: {e}")
@@ -3401,6 +3433,12 @@ async def terminal_websocket(
             except:
                 pass
         finally:
+            # Don't drop coalesced activity updates when leaving through an error
+            if uncommitted:
+                try:
+                    await db.commit()
+                except Exception as e:
+                    logger.error(f"Failed to commit pending session activity: {e}")
             break  # Exit the generator
 
 
@@ -9,13 +9,17 @@ Features:
 - Terminal or headless mode support
 """
 
+import asyncio
 import json
 import logging
 import os
 import shutil
+import threading
 import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Optional
+from types import MappingProxyType
+from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
@@ -51,6 +55,59 @@ def get_project_dir(user_id: str, project_name: str) -> str:
     return os.path.join(get_user_projects_dir(user_id), project_name)
 
 
+# Parsed JSON files (analysis metadata, dashboards with inline Plotly data) keyed by
+# path and validated against (mtime_ns, size), so repeat reads skip the parse until
+# Claude or the user rewrites the file.
+JSON_CACHE_MAX_ENTRIES = 64
+_json_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_json_cache_lock = threading.Lock()  # list_projects reads metadata from worker threads
+
+
+def load_json_cached(path: str) -> Any:
+    """
+    Load a JSON file, reusing the parsed result while the file is unchanged.
+
+    The returned object is shared by every caller (and thread), so it is
+    read-only: a top-level object comes back as a MappingProxyType, and nested
+    values must not be modified either. Copy it before changing anything.
+    """
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _json_cache_lock:
+        entry = _json_cache.get(path)
+        if entry is not None and entry[0] == stamp:
+            _json_cache.move_to_end(path)
+            return entry[1]
+
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = MappingProxyType(data)
+    with _json_cache_lock:
+        _json_cache[path] = (stamp, data)
+        _json_cache.move_to_end(path)
+        while len(_json_cache) > JSON_CACHE_MAX_ENTRIES:
+            _json_cache.popitem(last=False)
+    return data
+
+
+def count_visible_files(path: str) -> int:
+    """Count non-hidden files under path (recursively); 0 if it doesn't exist."""
+    count = 0
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    # Like os.walk: symlinked dirs aren't files and aren't descended
+                    if not entry.is_symlink():
+                        count += count_visible_files(entry.path)
+                elif not entry.name.startswith('.'):
+                    count += 1
+    except OSError:
+        pass
+    return count
+
+
 # ==================== Schemas ====================
 
 class CreateProjectRequest(BaseModel):
@@ -103,6 +160,32 @@ class ChatMessage(BaseModel):
 
 # ==================== Project Management ====================
 
+def build_project_response(name: str, project_path: str) -> ProjectResponse:
+    """Read one project's metadata and file/analysis status from disk."""
+    # Load project metadata (a missing file just leaves it empty)
+    metadata = {}
+    try:
+        metadata = load_json_cached(os.path.join(project_path, ".project.json"))
+    except:
+        pass
+
+    # Count data files
+    file_count = count_visible_files(os.path.join(project_path, "data"))
+
+    # Check for analysis and dashboard
+    analysis_exists = os.path.exists(os.path.join(project_path, ".analysis", "metadata.json"))
+    dashboard_exists = os.path.exists(os.path.join(project_path, ".dashboards", "default.json"))
+
+    return ProjectResponse(
+        name=name,
+        description=metadata.get('description'),
+        created_at=metadata.get('created_at', datetime.utcnow().isoformat()),
+        file_count=file_count,
+        has_analysis=analysis_exists,
+        has_dashboard=dashboard_exists
+    )
+
+
 @router.get("/projects", response_model=List[ProjectResponse])
 async def list_projects(user: User = Depends(require_valid_access)):
     """List all Data Studio projects for the current user."""
@@ -111,41 +194,16 @@ async def list_projects(user: User = Depends(require_valid_access)):
     if not os.path.exists(projects_dir):
         return []
 
-    projects = []
-    for name in os.listdir(projects_dir):
-        project_path = os.path.join(projects_dir, name)
-        if not os.path.isdir(project_path):
-            continue
+    # scandir entries carry the dirent type, so the directory checks need no extra stat
+    with os.scandir(projects_dir) as entries:
+        project_entries = [(entry.name, entry.path) for entry in entries if entry.is_dir()]
 
-        # Load project metadata
-        meta_path = os.path.join(project_path, ".project.json")
-        metadata = {}
-        if os.path.exists(meta_path):
-            try:
-                with open(meta_path, 'r') as f:
-                    metadata = json.load(f)
-            except:
-                pass
-
-        # Count data files
-        file_count = 0
-        data_dir = os.path.join(project_path, "data")
-        if os.path.exists(data_dir):
-            for root, dirs, files in os.walk(data_dir):
-                file_count += len([f for f in files if not f.startswith('.')])
-
-        # Check for analysis and dashboard
-        analysis_exists = os.path.exists(os.path.join(project_path, ".analysis", "metadata.json"))
-        dashboard_exists = os.path.exists(os.path.join(project_path, ".dashboards", "default.json"))
-
-        projects.append(ProjectResponse(
-            name=name,
-            description=metadata.get('description'),
-            created_at=metadata.get('created_at', datetime.utcnow().isoformat()),
-            file_count=file_count,
-            has_analysis=analysis_exists,
-            has_dashboard=dashboard_exists
-        ))
+    # Each project costs several small blocking reads; run them concurrently in
+    # worker threads instead of serially on the event loop
+    projects = await asyncio.gather(*(
+        asyncio.to_thread(build_project_response, name, project_path)
+        for name, project_path in project_entries
+    ))
 
     return sorted(projects, key=lambda p: p.created_at, reverse=True)
 
@@ -206,7 +264,8 @@ async def delete_project(
     if not os.path.exists(project_dir):
         raise HTTPException(status_code=404, detail="Project not found")
 
-    shutil.rmtree(project_dir)
+    # Walk the tree off the event loop; projects can hold large datasets
+    await asyncio.to_thread(shutil.rmtree, project_dir)
     return {"status": "deleted", "name": project_name}
 
 
@@ -401,8 +460,7 @@ async def analyze_project(
     if not analyze_request.force:
         metadata_path = os.path.join(project_dir, ".analysis", "metadata.json")
         if os.path.exists(metadata_path):
-            with open(metadata_path, 'r') as f:
-                return {"status": "cached", "metadata": json.load(f)}
+            return {"status": "cached", "metadata": load_json_cached(metadata_path)}
 
     async def stream_analysis():
         """Stream analysis events as SSE."""
@@ -441,8 +499,7 @@ async def get_metadata(
     if not os.path.exists(metadata_path):
         raise HTTPException(status_code=404, detail="No analysis found. Run analyze first.")
 
-    with open(metadata_path, 'r') as f:
-        return json.load(f)
+    return load_json_cached(metadata_path)
 
 
 @router.get("/projects/{project_name}/insights")
@@ -486,14 +543,13 @@ async def list_dashboards(
             if filename.endswith('.json'):
                 dashboard_id = filename[:-5]
                 try:
-                    with open(os.path.join(dashboards_dir, filename), 'r') as f:
-                        data = json.load(f)
-                        dashboards.append({
-                            "id": dashboard_id,
-                            "name": data.get("name", dashboard_id),
-                            "widget_count": len(data.get("widgets", [])),
-                            "updated_at": data.get("updated_at")
-                        })
+                    data = load_json_cached(os.path.join(dashboards_dir, filename))
+                    dashboards.append({
+                        "id": dashboard_id,
+                        "name": data.get("name", dashboard_id),
+                        "widget_count": len(data.get("widgets", [])),
+                        "updated_at": data.get("updated_at")
+                    })
                 except:
                     pass
 
@@ -517,8 +573,7 @@ async def get_dashboard(
     if not os.path.exists(dashboard_path):
         raise HTTPException(status_code=404, detail="Dashboard not found")
 
-    with open(dashboard_path, 'r') as f:
-        return json.load(f)
+    return load_json_cached(dashboard_path)
 
 
 @router.post("/projects/{project_name}/dashboards/generate")
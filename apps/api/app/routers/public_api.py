@@ -14,36 +14,98 @@ Skills implemented:
 """
 
 import os
+import re
 import uuid
 import json
+import time
 import base64
 import asyncio
+import hashlib
+import importlib.util
 import logging
+from collections import OrderedDict
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Literal
+from typing import AsyncGenerator, Optional, List, Literal, Tuple, Union
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger("public_api")
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 
 # Load environment from settings
 from app.core.config import settings
 
-# AI providers (lazy initialization)
+# AI providers (lazy initialization; the OpenAI SDK is only imported on first use)
 from anthropic import AsyncAnthropic
-from openai import AsyncOpenAI
 
 # File processing
 import aiofiles
+import httpx
 
 router = APIRouter(prefix="/api/public", tags=["Public API"])
 
 # Initialize AI clients lazily
 _anthropic_client = None
 _openai_client = None
+_http_client = None
+_fetch_client = None  # User-supplied URL fetches only, see get_fetch_client
+
+# pandas can parse CSV uploads with the Arrow engine when pyarrow is installed.
+# find_spec only locates the package, so this keeps pandas/pyarrow out of startup.
+_PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared connection pool for the AI SDK clients and outbound URL fetches."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=httpx.Timeout(600.0, connect=5.0),  # SDK default read timeout; long generations
+        )
+    return _http_client
+
+
+def get_fetch_client() -> httpx.AsyncClient:
+    """
+    Separate client for fetching user-supplied URLs (/summarize).
+
+    Kept apart from the SDK pool so arbitrary sites can't tie up its connections,
+    and its cookie jar rejects every cookie so nothing one caller's fetch sets is
+    sent on another caller's request.
+    """
+    global _fetch_client
+    if _fetch_client is None:
+        _fetch_client = httpx.AsyncClient(
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+    return _fetch_client
+
+
+async def close_http_client():
+    """Close the shared HTTP clients (called on application shutdown)."""
+    global _http_client, _fetch_client, _anthropic_client, _openai_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        _anthropic_client = None
+        _openai_client = None
+    if _fetch_client is not None:
+        await _fetch_client.aclose()
+        _fetch_client = None
 
 
 def get_anthropic_client():
@@ -52,7 +114,13 @@ def get_anthropic_client():
         api_key = settings.ANTHROPIC_API_KEY
         if not api_key:
             raise HTTPException(status_code=500, detail="Anthropic API key not configured")
-        _anthropic_client = AsyncAnthropic(api_key=api_key)
+        # The SDK retries rate limits, 5xx and connection errors itself: exponential
+        # backoff with jitter, honoring Retry-After, bounded by max_retries.
+        _anthropic_client = AsyncAnthropic(
+            api_key=api_key,
+            http_client=get_http_client(),
+            max_retries=settings.PUBLIC_API_CLAUDE_MAX_RETRIES
+        )
     return _anthropic_client
 
 
@@ -62,7 +130,12 @@ def get_openai_client():
         api_key = settings.OPENAI_API_KEY
         if not api_key:
             raise HTTPException(status_code=500, detail="OpenAI API key not configured")
-        _openai_client = AsyncOpenAI(api_key=api_key)
+        from openai import AsyncOpenAI
+        _openai_client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=get_http_client(),
+            max_retries=settings.PUBLIC_API_OPENAI_MAX_RETRIES
+        )
     return _openai_client
 
 # Output directory for generated files (uses config for Mac/Pi compatibility)
@@ -166,23 +239,257 @@ class DataAnalysisResponse(BaseModel):
     follow_up_questions: List[str]
 
 
+# ============ Rate Limiting ============
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. The
+    lock only guards the token arithmetic; waiters sleep outside it, so a
+    caller waiting for a refill never blocks callers that can proceed.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        # Checked up front: rate 0 would divide by zero on the first throttled call,
+        # capacity < 1 would never hand out a token
+        if rate <= 0:
+            raise ValueError(f"TokenBucket rate must be > 0, got {rate}")
+        if capacity < 1:
+            raise ValueError(f"TokenBucket capacity must be >= 1, got {capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+
+claude_rate_limiter = TokenBucket(
+    rate=settings.PUBLIC_API_CLAUDE_RPM / 60.0,
+    capacity=settings.PUBLIC_API_CLAUDE_BURST
+)
+
+
+# ============ Response Cache ============
+
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+JSON_TOOL_NAME = "respond"  # Forced tool used by call_claude_json for structured replies
+RESPONSE_CACHE_TTL_SECONDS = 3600
+RESPONSE_CACHE_MAX_ENTRIES = 256
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache of Claude replies with a per-entry TTL.
+
+    Repeated requests (client retries, resubmitted forms, the same document
+    asked the same question) are answered without a model round-trip. Only the
+    analytical endpoints opt in; generative ones must return a fresh reply on
+    every call. Prompts are normalized before keying so requests that differ
+    only in trailing whitespace share an entry.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Drop trailing whitespace per line; indentation and blank lines are kept."""
+        return "\n".join(line.rstrip() for line in text.strip().splitlines())
+
+    def make_key(self, system: str, prompt: str, max_tokens: int) -> str:
+        normalized = "\x00".join((CLAUDE_MODEL, str(max_tokens), self._normalize(system), self._normalize(prompt)))
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Union[str, dict]]:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, value: Union[str, dict]):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+response_cache = ResponseCache()
+
+
 # ============ Helper Functions ============
 
-async def call_claude(prompt: str, system: str = "", max_tokens: int = 4096) -> str:
-    """Call Claude API for text generation."""
+def _system_blocks(system: str) -> list:
+    """
+    Wrap a system prompt as a cacheable block.
+
+    Prompt caching only hits when the prefix is byte-identical across calls, so
+    the system prompt must stay static: per-request values (focus, tone, retrieved
+    context, ...) belong in the user message, never interpolated into system.
+    """
+    return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+
+
+async def call_claude(prompt: str, system: str = "", max_tokens: int = 4096, use_cache: bool = False) -> str:
+    """Call Claude API for text generation (use_cache serves repeated requests from the response cache)."""
+    system = system if system else "You are a helpful AI assistant."
+    cache_key = response_cache.make_key(system, prompt, max_tokens) if use_cache else None
+    if cache_key:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    await claude_rate_limiter.acquire()
     try:
         client = get_anthropic_client()
         response = await client.messages.create(
-            model="claude-sonnet-4-20250514",
+            model=CLAUDE_MODEL,
             max_tokens=max_tokens,
-            system=system if system else "You are a helpful AI assistant.",
+            system=_system_blocks(system),
             messages=[{"role": "user", "content": prompt}]
         )
-        return response.content[0].text
+        text = "".join(block.text for block in response.content if block.type == "text")
+    except Exception as e:
+        logger.error(f"AI error: {e}")
+        raise HTTPException(status_code=500, detail="AI processing failed")
+
+    if cache_key:
+        response_cache.set(cache_key, text)
+    return text
+
+
+async def call_claude_json(
+    prompt: str,
+    system: str = "",
+    max_tokens: int = 4096,
+    schema: Optional[dict] = None,
+    use_cache: bool = False
+) -> dict:
+    """
+    Call Claude and get the reply back as a parsed JSON object.
+
+    Forces a single tool call whose input is the structured reply, so there is no
+    code fence to strip or free-form text to parse. `schema` constrains the object
+    (any object is accepted when omitted; the system prompt describes the fields).
+    A reply cut off at max_tokens or without the tool call is a 502 and never cached.
+    """
+    system = system if system else "You are a helpful AI assistant."
+    cache_key = "json:" + response_cache.make_key(system, prompt, max_tokens) if use_cache else None
+    if cache_key:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    await claude_rate_limiter.acquire()
+    try:
+        client = get_anthropic_client()
+        response = await client.messages.create(
+            model=CLAUDE_MODEL,
+            max_tokens=max_tokens,
+            system=_system_blocks(system),
+            messages=[{"role": "user", "content": prompt}],
+            tools=[{
+                "name": JSON_TOOL_NAME,
+                "description": "Return the complete response as a single JSON object.",
+                "input_schema": schema or {"type": "object"}
+            }],
+            tool_choice={"type": "tool", "name": JSON_TOOL_NAME}
+        )
     except Exception as e:
         logger.error(f"AI error: {e}")
         raise HTTPException(status_code=500, detail="AI processing failed")
 
+    # A truncated tool call carries a partial (or empty) input object
+    if response.stop_reason == "max_tokens":
+        logger.warning(f"AI structured reply truncated at max_tokens={max_tokens}")
+        raise HTTPException(status_code=502, detail="AI response was truncated")
+    result = next((block.input for block in response.content if block.type == "tool_use"), None)
+    if not isinstance(result, dict):
+        logger.warning(f"AI reply had no structured response (stop_reason={response.stop_reason})")
+        raise HTTPException(status_code=502, detail="AI returned no structured response")
+
+    if cache_key:
+        response_cache.set(cache_key, result)
+    return result
+
+
+async def call_claude_many(
+    prompts: List[str],
+    system: str = "",
+    max_tokens: int = 4096,
+    max_concurrency: int = 5
+) -> list:
+    """
+    Run independent call_claude requests concurrently, at most max_concurrency in flight.
+
+    Returns results in prompt order; a failed request yields its exception
+    instead of cancelling the rest.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _one(prompt: str) -> str:
+        async with semaphore:
+            return await call_claude(prompt, system, max_tokens=max_tokens)
+
+    return await asyncio.gather(*(_one(p) for p in prompts), return_exceptions=True)
+
+
+async def stream_claude(prompt: str, system: str = "", max_tokens: int = 4096) -> AsyncGenerator[str, None]:
+    """Stream Claude's reply as text deltas so callers can forward the first tokens immediately."""
+    system = system if system else "You are a helpful AI assistant."
+    await claude_rate_limiter.acquire()
+    try:
+        client = get_anthropic_client()
+        async with client.messages.stream(
+            model=CLAUDE_MODEL,
+            max_tokens=max_tokens,
+            system=_system_blocks(system),
+            messages=[{"role": "user", "content": prompt}]
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"AI streaming error: {e}")
+        raise HTTPException(status_code=500, detail="AI processing failed")
+
+
+# HTML-to-text patterns for URL summaries, compiled once
+_HTML_SCRIPT_STYLE_RE = re.compile(r'<script[^>]*>.*?</script>|<style[^>]*>.*?</style>', re.DOTALL)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def strip_code_fence(text: str) -> str:
+    """Strip surrounding whitespace and a ```lang ... ``` fence from a model reply."""
+    text = text.strip()
+    if text.startswith("```"):
+        lines = text.split("\n")
+        text = "\n".join(lines[1:-1] if lines[-1].startswith("```") else lines[1:])
+    return text
+
 
 async def extract_text_from_file(file: UploadFile) -> str:
     """Extract text content from uploaded file."""
@@ -196,10 +503,7 @@ async def extract_text_from_file(file: UploadFile) -> str:
             import pypdf
             import io
             reader = pypdf.PdfReader(io.BytesIO(content))
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            return "".join(page.extract_text() + "\n" for page in reader.pages)
         except Exception as e:
             raise HTTPException(status_code=400, detail="Failed to parse PDF")
     elif filename.endswith('.csv'):
@@ -214,13 +518,8 @@ async def extract_text_from_file(file: UploadFile) -> str:
 
 # ============ Endpoints ============
 
-@router.post("/diagram", response_model=DiagramResponse)
-async def generate_diagram(request: DiagramRequest):
-    """
-    Generate a Mermaid diagram from natural language description.
-
-    Returns Mermaid code and a preview URL.
-    """
+def _diagram_prompts(request: DiagramRequest) -> tuple:
+    """Build (system_prompt, user_prompt) for a diagram request."""
     # Determine diagram type
     type_hint = ""
     if request.diagram_type != "auto":
@@ -241,14 +540,11 @@ Description: {request.description}
 
 Generate the Mermaid diagram code:"""
 
-    mermaid_code = await call_claude(user_prompt, system_prompt, max_tokens=2000)
+    return system_prompt, user_prompt
 
-    # Clean up response (remove markdown code blocks if present)
-    mermaid_code = mermaid_code.strip()
-    if mermaid_code.startswith("```"):
-        lines = mermaid_code.split("\n")
-        mermaid_code = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
 
+async def _save_diagram(mermaid_code: str) -> str:
+    """Save Mermaid code under a new diagram ID and return the ID."""
     # Generate unique ID
     diagram_id = str(uuid.uuid4())[:8]
 
@@ -257,6 +553,25 @@ Generate the Mermaid diagram code:"""
     async with aiofiles.open(output_path, 'w') as f:
         await f.write(mermaid_code)
 
+    return diagram_id
+
+
+@router.post("/diagram", response_model=DiagramResponse)
+async def generate_diagram(request: DiagramRequest):
+    """
+    Generate a Mermaid diagram from natural language description.
+
+    Returns Mermaid code and a preview URL.
+    """
+    system_prompt, user_prompt = _diagram_prompts(request)
+
+    mermaid_code = await call_claude(user_prompt, system_prompt, max_tokens=2000)
+
+    # Clean up response (remove markdown code blocks if present)
+    mermaid_code = strip_code_fence(mermaid_code)
+
+    diagram_id = await _save_diagram(mermaid_code)
+
     return DiagramResponse(
         mermaid_code=mermaid_code,
         diagram_id=diagram_id,
@@ -265,6 +580,47 @@ Generate the Mermaid diagram code:"""
     )
 
 
+@router.post("/diagram/stream")
+async def generate_diagram_stream(request: DiagramRequest):
+    """
+    Generate a Mermaid diagram, streaming the code as SSE while Claude writes it.
+
+    Emits {"type": "text"} deltas, then a final {"type": "complete"} event
+    with the cleaned code, diagram ID and preview URL.
+    """
+    system_prompt, user_prompt = _diagram_prompts(request)
+
+    async def stream_diagram():
+        """Stream diagram generation events as SSE."""
+        parts = []
+        try:
+            async for text in stream_claude(user_prompt, system_prompt, max_tokens=2000):
+                parts.append(text)
+                yield f"data: {json.dumps({'type': 'text', 'content': text})}\n\n"
+        except HTTPException as e:
+            yield f"data: {json.dumps({'type': 'error', 'content': e.detail})}\n\n"
+            return
+
+        mermaid_code = strip_code_fence("".join(parts))
+        diagram_id = await _save_diagram(mermaid_code)
+        complete = {
+            "type": "complete",
+            "mermaid_code": mermaid_code,
+            "diagram_id": diagram_id,
+            "preview_url": f"/api/public/diagram/{diagram_id}/preview"
+        }
+        yield f"data: {json.dumps(complete)}\n\n"
+
+    return StreamingResponse(
+        stream_diagram(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive"
+        }
+    )
+
+
 @router.get("/diagram/{diagram_id}/preview")
 async def preview_diagram(diagram_id: str):
     """Get diagram preview as HTML with rendered Mermaid."""
@@ -328,6 +684,19 @@ async def get_diagram_code(diagram_id: str):
     return {"diagram_id": diagram_id, "mermaid_code": mermaid_code}
 
 
+# Structured reply schemas passed to call_claude_json
+DOCUMENT_QA_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "answer": {"type": "string"},
+        "confidence": {"type": "number"},
+        "sources": {"type": "array", "items": {"type": "object"}},
+        "follow_up_questions": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["answer", "sources"]
+}
+
+
 @router.post("/document-qa", response_model=DocumentQAResponse)
 async def document_qa(
     question: str = Form(...),
@@ -364,31 +733,49 @@ Question: {question}
 
 Analyze the document and answer the question. Respond in JSON format."""
 
-    response = await call_claude(user_prompt, system_prompt, max_tokens=2000)
+    result = await call_claude_json(user_prompt, system_prompt, max_tokens=2000, schema=DOCUMENT_QA_SCHEMA, use_cache=True)
+    return DocumentQAResponse(
+        answer=result.get("answer", ""),
+        confidence=result.get("confidence", 0.8),
+        sources=result.get("sources", []),
+        follow_up_questions=result.get("follow_up_questions", [])
+    )
 
-    # Parse JSON response
-    try:
-        # Clean up response
-        response = response.strip()
-        if response.startswith("```"):
-            lines = response.split("\n")
-            response = "\n".join(lines[1:-1] if lines[-1].startswith("```") else lines[1:])
-
-        result = json.loads(response)
-        return DocumentQAResponse(
-            answer=result.get("answer", response),
-            confidence=result.get("confidence", 0.8),
-            sources=result.get("sources", []),
-            follow_up_questions=result.get("follow_up_questions", [])
-        )
-    except json.JSONDecodeError:
-        # Return as plain answer if JSON parsing fails
-        return DocumentQAResponse(
-            answer=response,
-            confidence=0.7,
-            sources=[],
-            follow_up_questions=[]
-        )
+
+# Prompt fragments for /summarize, keyed by the request's Literal options
+SUMMARY_LENGTH_GUIDE = {
+    "brief": "1-2 sentences, approximately 50 words",
+    "standard": "1-2 paragraphs, approximately 150 words",
+    "detailed": "Comprehensive summary with sections, approximately 500 words"
+}
+
+SUMMARY_FORMAT_GUIDE = {
+    "paragraph": "flowing prose paragraphs",
+    "bullets": "bullet point list of key points",
+    "executive": "TL;DR followed by key points and recommendations"
+}
+
+
+SUMMARIZE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "key_points": {"type": "array", "items": {"type": "string"}},
+        "topics": {"type": "array", "items": {"type": "string"}},
+        "original_words": {"type": "integer"},
+        "summary_words": {"type": "integer"}
+    },
+    "required": ["summary", "key_points"]
+}
+
+
+# Content longer than one chunk is summarized part by part (concurrently via
+# call_claude_many) and the part summaries are then summarized together
+SUMMARY_CHUNK_CHARS = 30000
+SUMMARY_MAX_CHUNKS = 4  # Content past this many chunks is dropped
+SUMMARY_PART_SYSTEM = """You summarize one part of a longer document. Write a dense plain-text summary of
+this part only, keeping names, numbers and conclusions, so it can be combined with the
+summaries of the other parts."""
 
 
 @router.post("/summarize", response_model=SummarizeResponse)
@@ -401,81 +788,106 @@ async def summarize(request: SummarizeRequest):
     # If URL, fetch content
     if request.content_type == "url":
         try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(content, follow_redirects=True, timeout=30)
-                content = resp.text
-                # Basic HTML to text (simple extraction)
-                import re
-                content = re.sub(r'<script[^>]*>.*?</script>', '', content, flags=re.DOTALL)
-                content = re.sub(r'<style[^>]*>.*?</style>', '', content, flags=re.DOTALL)
-                content = re.sub(r'<[^>]+>', ' ', content)
-                content = re.sub(r'\s+', ' ', content).strip()
+            resp = await get_fetch_client().get(content, follow_redirects=True, timeout=30)
+            content = resp.text
+            # Basic HTML to text (simple extraction)
+            content = _HTML_SCRIPT_STYLE_RE.sub('', content)
+            content = _HTML_TAG_RE.sub(' ', content)
+            content = _WHITESPACE_RE.sub(' ', content).strip()
         except Exception as e:
             raise HTTPException(status_code=400, detail="Failed to fetch URL")
 
-    # Length guidelines
-    length_guide = {
-        "brief": "1-2 sentences, approximately 50 words",
-        "standard": "1-2 paragraphs, approximately 150 words",
-        "detailed": "Comprehensive summary with sections, approximately 500 words"
-    }
-
-    format_guide = {
-        "paragraph": "flowing prose paragraphs",
-        "bullets": "bullet point list of key points",
-        "executive": "TL;DR followed by key points and recommendations"
-    }
-
-    system_prompt = f"""You are a summarization expert. Create {request.focus}-focused summaries.
+    system_prompt = """You are a summarization expert. Create summaries with the requested focus.
 
 Respond in this JSON format:
-{{
+{
     "summary": "The summary text",
     "key_points": ["point 1", "point 2", "point 3"],
     "topics": ["topic1", "topic2"],
     "original_words": 1234,
     "summary_words": 123
-}}"""
+}"""
+
+    original_words = None
+    if len(content) > SUMMARY_CHUNK_CHARS:
+        # Too long for one prompt: summarize consecutive parts concurrently, then
+        # summarize those summaries below
+        chunks = [
+            content[i:i + SUMMARY_CHUNK_CHARS]
+            for i in range(0, min(len(content), SUMMARY_CHUNK_CHARS * SUMMARY_MAX_CHUNKS), SUMMARY_CHUNK_CHARS)
+        ]
+        part_summaries = await call_claude_many(
+            [
+                f"Part {i + 1} of {len(chunks)}. Focus: {request.focus}\n\nContent:\n---\n{chunk}\n---"
+                for i, chunk in enumerate(chunks)
+            ],
+            SUMMARY_PART_SYSTEM,
+            max_tokens=1000
+        )
+        for part in part_summaries:
+            if isinstance(part, HTTPException):
+                raise part
+            if isinstance(part, Exception):
+                logger.error(f"Part summary failed: {part}")
+                raise HTTPException(status_code=500, detail="AI processing failed")
+        original_words = len(content.split())
+        content_for_prompt = "\n\n".join(
+            f"[Summary of part {i + 1} of {len(chunks)}]\n{part}" for i, part in enumerate(part_summaries)
+        )
+    else:
+        content_for_prompt = content
 
     user_prompt = f"""Summarize the following content.
 
-Length: {length_guide[request.length]}
-Format: {format_guide[request.format]}
+Length: {SUMMARY_LENGTH_GUIDE[request.length]}
+Format: {SUMMARY_FORMAT_GUIDE[request.format]}
 Focus: {request.focus}
 
 Content:
 ---
-{content[:30000]}
+{content_for_prompt}
 ---
 
 Provide a {request.length} summary in {request.format} format."""
 
-    response = await call_claude(user_prompt, system_prompt, max_tokens=2000)
+    result = await call_claude_json(user_prompt, system_prompt, max_tokens=2000, schema=SUMMARIZE_SCHEMA)
+    summary = result.get("summary", "")
+    return SummarizeResponse(
+        summary=summary,
+        key_points=result.get("key_points", []),
+        word_count={
+            "original": original_words or result.get("original_words", len(content.split())),
+            "summary": result.get("summary_words", len(summary.split()))
+        },
+        topics=result.get("topics", [])
+    )
 
-    try:
-        response = response.strip()
-        if response.startswith("```"):
-            lines = response.split("\n")
-            response = "\n".join(lines[1:-1] if lines[-1].startswith("```") else lines[1:])
-
-        result = json.loads(response)
-        return SummarizeResponse(
-            summary=result.get("summary", response),
-            key_points=result.get("key_points", []),
-            word_count={
-                "original": result.get("original_words", len(content.split())),
-                "summary": result.get("summary_words", len(result.get("summary", "").split()))
-            },
-            topics=result.get("topics", [])
-        )
-    except json.JSONDecodeError:
-        return SummarizeResponse(
-            summary=response,
-            key_points=[],
-            word_count={"original": len(content.split()), "summary": len(response.split())},
-            topics=[]
-        )
+
+CODE_REVIEW_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer"},
+        "grade": {"type": "string"},
+        "issues": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "severity": {"type": "string", "enum": ["critical", "high", "medium", "low"]},
+                    "category": {"type": "string"},
+                    "line": {"type": ["integer", "null"]},
+                    "message": {"type": "string"},
+                    "suggestion": {"type": "string"},
+                    "code_fix": {"type": ["string", "null"]}
+                },
+                "required": ["severity", "message"]
+            }
+        },
+        "summary": {"type": "string"},
+        "positive": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["score", "grade", "issues", "summary"]
+}
 
 
 @router.post("/code-review", response_model=CodeReviewResponse)
@@ -517,42 +929,54 @@ Code:
 
 Provide detailed review in JSON format."""
 
-    response = await call_claude(user_prompt, system_prompt, max_tokens=3000)
+    result = await call_claude_json(user_prompt, system_prompt, max_tokens=3000, schema=CODE_REVIEW_SCHEMA, use_cache=True)
+
+    issues = []
+    for issue in result.get("issues", []):
+        issues.append(CodeReviewIssue(
+            severity=issue.get("severity", "medium"),
+            category=issue.get("category", "style"),
+            line=issue.get("line"),
+            message=issue.get("message", ""),
+            suggestion=issue.get("suggestion", ""),
+            code_fix=issue.get("code_fix")
+        ))
+
+    return CodeReviewResponse(
+        score=result.get("score", 70),
+        grade=result.get("grade", "C"),
+        issues=issues,
+        summary=result.get("summary", "Review complete."),
+        positive=result.get("positive", [])
+    )
 
-    try:
-        response = response.strip()
-        if response.startswith("```"):
-            lines = response.split("\n")
-            response = "\n".join(lines[1:-1] if lines[-1].startswith("```") else lines[1:])
-
-        result = json.loads(response)
-
-        issues = []
-        for issue in result.get("issues", []):
-            issues.append(CodeReviewIssue(
-                severity=issue.get("severity", "medium"),
-                category=issue.get("category", "style"),
-                line=issue.get("line"),
-                message=issue.get("message", ""),
-                suggestion=issue.get("suggestion", ""),
-                code_fix=issue.get("code_fix")
-            ))
-
-        return CodeReviewResponse(
-            score=result.get("score", 70),
-            grade=result.get("grade", "C"),
-            issues=issues,
-            summary=result.get("summary", "Review complete."),
-            positive=result.get("positive", [])
-        )
-    except json.JSONDecodeError:
-        return CodeReviewResponse(
-            score=50,
-            grade="C",
-            issues=[],
-            summary=response,
-            positive=[]
-        )
+
+# Prompt fragments for /content, keyed by the request's Literal options
+CONTENT_LENGTH_GUIDE = {
+    "short": "100-200 words",
+    "medium": "300-500 words",
+    "long": "800-1200 words"
+}
+
+CONTENT_TYPE_GUIDE = {
+    "blog": "SEO-optimized blog post with headers, introduction, body, and conclusion",
+    "email": "Marketing email with subject line, preview text, body, and CTA",
+    "social": "Social media post optimized for {platform}",
+    "product": "Product description highlighting features, benefits, and use cases",
+    "ad": "Advertisement copy with headline, description, and CTA"
+}
+
+
+CONTENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "content": {"type": "string"},
+        "title": {"type": "string"},
+        "meta_description": {"type": "string"},
+        "hashtags": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["content"]
+}
 
 
 @router.post("/content", response_model=ContentResponse)
@@ -560,92 +984,73 @@ async def generate_content(request: ContentRequest):
     """
     Generate marketing content: blog posts, emails, social media, etc.
     """
-    # Length guidelines
-    length_guide = {
-        "short": "100-200 words",
-        "medium": "300-500 words",
-        "long": "800-1200 words"
-    }
-
-    type_guide = {
-        "blog": "SEO-optimized blog post with headers, introduction, body, and conclusion",
-        "email": "Marketing email with subject line, preview text, body, and CTA",
-        "social": f"Social media post optimized for {request.platform or 'general platforms'}",
-        "product": "Product description highlighting features, benefits, and use cases",
-        "ad": "Advertisement copy with headline, description, and CTA"
-    }
-
+    type_hint = CONTENT_TYPE_GUIDE[request.content_type].format(
+        platform=request.platform or "general platforms"
+    )
     keywords_str = ", ".join(request.keywords) if request.keywords else "none specified"
 
-    system_prompt = f"""You are an expert {request.content_type} content writer.
-Write in a {request.tone} tone for a {request.audience} audience.
+    system_prompt = """You are an expert content writer.
+Write in the requested tone for the requested audience.
 
 Respond in JSON format:
-{{
+{
     "content": "The main content",
     "title": "Suggested title (for blogs/emails)",
     "meta_description": "SEO meta description (for blogs)",
     "hashtags": ["#tag1", "#tag2"]
-}}"""
+}"""
 
     user_prompt = f"""Create {request.content_type} content about: {request.topic}
 
-Type: {type_guide[request.content_type]}
-Length: {length_guide[request.length]}
+Type: {type_hint}
+Length: {CONTENT_LENGTH_GUIDE[request.length]}
 Tone: {request.tone}
 Audience: {request.audience}
 Keywords to include: {keywords_str}
 
 Generate the content in JSON format."""
 
-    response = await call_claude(user_prompt, system_prompt, max_tokens=2500)
+    result = await call_claude_json(user_prompt, system_prompt, max_tokens=2500, schema=CONTENT_SCHEMA)
+    content = result.get("content", "")
 
-    try:
-        response = response.strip()
-        if response.startswith("```"):
-            lines = response.split("\n")
-            response = "\n".join(lines[1:-1] if lines[-1].startswith("```") else lines[1:])
-
-        result = json.loads(response)
-        content = result.get("content", response)
-
-        return ContentResponse(
-            content=content,
-            title=result.get("title"),
-            meta_description=result.get("meta_description"),
-            hashtags=result.get("hashtags", []),
-            word_count=len(content.split())
-        )
-    except json.JSONDecodeError:
-        return ContentResponse(
-            content=response,
-            title=None,
-            meta_description=None,
-            hashtags=[],
-            word_count=len(response.split())
-        )
+    return ContentResponse(
+        content=content,
+        title=result.get("title"),
+        meta_description=result.get("meta_description"),
+        hashtags=result.get("hashtags", []),
+        word_count=len(content.split())
+    )
 
 
-@router.post("/analyze-data", response_model=DataAnalysisResponse)
-async def analyze_data(
-    file: UploadFile = File(...),
-    question: Optional[str] = Form(None),
-    analysis_type: str = Form("overview")
-):
-    """
-    Upload CSV/Excel data and get AI-powered analysis.
-    """
-    # Read file content
-    content = await file.read()
-    filename = file.filename.lower()
+# Column statistics in the prompt are computed over at most this many leading rows,
+# so prompt building stays bounded on very large uploads.
+DATA_SUMMARY_SAMPLE_ROWS = 1000
+DATA_SUMMARY_CACHE_MAX_ENTRIES = 32
+
+# sha256(extension + upload bytes) -> (summary text, rows, columns), LRU order
+_data_summary_cache: "OrderedDict[str, tuple]" = OrderedDict()
 
+
+def _build_data_summary(content: bytes, filename: str) -> Tuple[str, int, int]:
+    """Parse an uploaded CSV/Excel file and describe it for the analysis prompt.
+
+    Returns the summary text, row count and column count.
+    """
     # Parse data
     try:
         import pandas as pd
         import io
 
         if filename.endswith('.csv'):
-            df = pd.read_csv(io.BytesIO(content))
+            df = None
+            if _PYARROW_AVAILABLE:
+                # Multithreaded Arrow parser; fall back to the C parser for CSVs it rejects
+                try:
+                    df = pd.read_csv(io.BytesIO(content), engine="pyarrow")
+                except Exception:
+                    df = None
+            if df is None:
+                df = pd.read_csv(io.BytesIO(content))
         elif filename.endswith(('.xlsx', '.xls')):
             df = pd.read_excel(io.BytesIO(content))
         else:
@@ -654,19 +1059,69 @@ async def analyze_data(
         raise HTTPException(status_code=400, detail="Failed to parse file")
 
     # Generate data summary
+    sample = df.head(DATA_SUMMARY_SAMPLE_ROWS)
+    sampled = len(sample) < len(df)
+    stats_label = f"Statistical summary (approx, first {len(sample)} rows)" if sampled else "Statistical summary"
+    approx = " approx" if sampled else ""
+    # One line per column (dtype, unique count, sample values) built in a single join
+    columns_info = "\n".join(
+        f"  - {col} ({dtype}, {count}{approx} unique): {sample[col].dropna().head(3).tolist()}"
+        for (col, dtype), count in zip(df.dtypes.items(), sample.nunique())
+    )
+
     data_summary = f"""Dataset Overview:
 - Rows: {len(df)}
-- Columns: {len(df.columns)}
-- Column names: {', '.join(df.columns.tolist())}
-- Data types: {df.dtypes.to_dict()}
+- Columns ({len(df.columns)}):
+{columns_info}
 
 First 10 rows:
-{df.head(10).to_string()}
+{sample.head(10).to_string()}
 
-Statistical summary:
-{df.describe().to_string()}
+{stats_label}:
+{sample.describe().to_string()}
 """
 
+    return data_summary, len(df), len(df.columns)
+
+
+DATA_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "object"},
+        "insights": {"type": "array", "items": {"type": "object"}},
+        "recommendations": {"type": "array", "items": {"type": "string"}},
+        "follow_up_questions": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["summary", "insights", "recommendations"]
+}
+
+
+@router.post("/analyze-data", response_model=DataAnalysisResponse)
+async def analyze_data(
+    file: UploadFile = File(...),
+    question: Optional[str] = Form(None),
+    analysis_type: str = Form("overview")
+):
+    """
+    Upload CSV/Excel data and get AI-powered analysis.
+    """
+    # Read file content
+    content = await file.read()
+    filename = file.filename.lower()
+
+    # Identical uploads (retries, re-asking with a different question) reuse the
+    # summary instead of re-parsing the file with pandas
+    summary_key = hashlib.sha256(filename.rsplit('.', 1)[-1].encode("utf-8") + b"\x00" + content).hexdigest()
+    cached_summary = _data_summary_cache.get(summary_key)
+    if cached_summary is not None:
+        _data_summary_cache.move_to_end(summary_key)
+        data_summary, row_count, column_count = cached_summary
+    else:
+        data_summary, row_count, column_count = _build_data_summary(content, filename)
+        _data_summary_cache[summary_key] = (data_summary, row_count, column_count)
+        if len(_data_summary_cache) > DATA_SUMMARY_CACHE_MAX_ENTRIES:
+            _data_summary_cache.popitem(last=False)
+
     question_prompt = f"\n\nSpecific question: {question}" if question else ""
 
     system_prompt = """You are a data analyst expert. Analyze datasets and provide actionable insights.
@@ -699,29 +1154,14 @@ Analysis type: {analysis_type}
 
 Provide insights in JSON format."""
 
-    response = await call_claude(user_prompt, system_prompt, max_tokens=3000)
+    result = await call_claude_json(user_prompt, system_prompt, max_tokens=3000, schema=DATA_ANALYSIS_SCHEMA, use_cache=True)
 
-    try:
-        response = response.strip()
-        if response.startswith("```"):
-            lines = response.split("\n")
-            response = "\n".join(lines[1:-1] if lines[-1].startswith("```") else lines[1:])
-
-        result = json.loads(response)
-
-        return DataAnalysisResponse(
-            summary=result.get("summary", {"rows": len(df), "columns": len(df.columns)}),
-            insights=result.get("insights", []),
-            recommendations=result.get("recommendations", []),
-            follow_up_questions=result.get("follow_up_questions", [])
-        )
-    except json.JSONDecodeError:
-        return DataAnalysisResponse(
-            summary={"rows": len(df), "columns": len(df.columns), "raw_analysis": response},
-            insights=[],
-            recommendations=[],
-            follow_up_questions=[]
-        )
+    return DataAnalysisResponse(
+        summary=result.get("summary", {"rows": row_count, "columns": column_count}),
+        insights=result.get("insights", []),
+        recommendations=result.get("recommendations", []),
+        follow_up_questions=result.get("follow_up_questions", [])
+    )
 
 
 # ============ Health & Info ============
@@ -734,6 +1174,7 @@ async def public_api_info():
         "version": "1.0.0",
         "endpoints": {
             "/diagram": "Generate Mermaid diagrams from text",
+            "/diagram/stream": "Generate Mermaid diagrams with streamed output (SSE)",
             "/document-qa": "Ask questions about uploaded documents",
             "/summarize": "Summarize text or URLs",
             "/code-review": "Review code for quality issues",
@@ -741,5 +1182,6 @@ async def public_api_info():
             "/analyze-data": "Analyze CSV/Excel data"
         },
         "documentation": "/docs#/Public%20API",
-        "pricing": "Contact for API access"
+        "pricing": "Contact for API access",
+        "cache": response_cache.stats
     }
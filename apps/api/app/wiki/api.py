@@ -435,18 +435,14 @@ async def save_wiki_cache(data: WikiCacheRequest) -> bool:
             provider=data.provider,
             model=data.model
         )
-        # Log size of data to be cached for debugging (avoid logging full content if large)
-        try:
-            payload_json = payload.model_dump_json()
-            payload_size = len(payload_json.encode('utf-8'))
-            logger.info(f"Payload prepared for caching. Size: {payload_size} bytes.")
-        except Exception as ser_e:
-            logger.warning(f"Could not serialize payload for size logging: {ser_e}")
-
+        # Serialize once with pydantic's native encoder and reuse the bytes for
+        # both the size log and the file write
+        payload_bytes = payload.model_dump_json(indent=2).encode('utf-8')
+        logger.info(f"Payload prepared for caching. Size: {len(payload_bytes)} bytes.")
 
         logger.info(f"Writing cache file to: {cache_path}")
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(payload.model_dump(), f, indent=2)
+        with open(cache_path, 'wb') as f:
+            f.write(payload_bytes)
         logger.info(f"Wiki cache successfully saved to {cache_path}")
         return True
     except IOError as e:
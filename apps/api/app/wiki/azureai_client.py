@@ -321,10 +321,11 @@ class AzureAIClient(ModelClient):
         completion: Union[ChatCompletion, Generator[ChatCompletionChunk, None, None]],
     ) -> CompletionUsage:
         if isinstance(completion, ChatCompletion):
+            completion_usage = completion.usage
             usage: CompletionUsage = CompletionUsage(
-                completion_tokens=completion.usage.completion_tokens,
-                prompt_tokens=completion.usage.prompt_tokens,
-                total_tokens=completion.usage.total_tokens,
+                completion_tokens=completion_usage.completion_tokens,
+                prompt_tokens=completion_usage.prompt_tokens,
+                total_tokens=completion_usage.total_tokens,
             )
             return usage
         else:
@@ -209,12 +209,10 @@ class DashscopeClient(ModelClient):
                 # ALWAYS extract the string content directly
                 try:
                     # Direct extraction of message content
-                    if (hasattr(completion, 'choices') and 
-                        len(completion.choices) > 0 and 
-                        hasattr(completion.choices[0], 'message') and 
-                        hasattr(completion.choices[0].message, 'content')):
-                        
-                        content = completion.choices[0].message.content
+                    choices = completion.choices
+                    message = getattr(choices[0], 'message', None) if len(choices) > 0 else None
+                    if message is not None and hasattr(message, 'content'):
+                        content = message.content
                         if isinstance(content, str):
                             parsed_data = content
                         else:
@@ -227,12 +225,13 @@ class DashscopeClient(ModelClient):
                     # Ultimate fallback
                     parsed_data = str(completion)
                 
+                completion_usage = completion.usage
                 return GeneratorOutput(
                     data=parsed_data,
                     usage=CompletionUsage(
-                        completion_tokens=completion.usage.completion_tokens,
-                        prompt_tokens=completion.usage.prompt_tokens,
-                        total_tokens=completion.usage.total_tokens,
+                        completion_tokens=completion_usage.completion_tokens,
+                        prompt_tokens=completion_usage.prompt_tokens,
+                        total_tokens=completion_usage.total_tokens,
                     ),
                     raw_response=str(completion),
                 )
@@ -241,8 +240,9 @@ class DashscopeClient(ModelClient):
                 content_parts = []
                 usage_info = None
                 for chunk in completion:
-                    if chunk.choices[0].delta.content:
-                        content_parts.append(chunk.choices[0].delta.content)
+                    delta_content = chunk.choices[0].delta.content
+                    if delta_content:
+                        content_parts.append(delta_content)
                     # Try to get usage info from the last chunk
                     if hasattr(chunk, 'usage') and chunk.usage:
                         usage_info = chunk.usage
@@ -274,10 +274,11 @@ class DashscopeClient(ModelClient):
     ) -> CompletionUsage:
         """Track the completion usage."""
         if isinstance(completion, ChatCompletion):
+            completion_usage = completion.usage
             return CompletionUsage(
-                completion_tokens=completion.usage.completion_tokens,
-                prompt_tokens=completion.usage.prompt_tokens,
-                total_tokens=completion.usage.total_tokens,
+                completion_tokens=completion_usage.completion_tokens,
+                prompt_tokens=completion_usage.prompt_tokens,
+                total_tokens=completion_usage.total_tokens,
             )
         else:
             # For streaming, we can't track usage accurately
@@ -1,7 +1,7 @@
 """OpenAI ModelClient integration."""
 
 import os
-import base64
+import binascii
 from typing import (
     Dict,
     Sequence,
@@ -53,6 +53,16 @@ from adalflow.components.model_client.utils import parse_embedding_response
 log = logging.getLogger(__name__)
 T = TypeVar("T")
 
+# OpenAI rejects images above 20MB; refuse before reading and encoding them.
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+# Read size for streaming base64; a multiple of 3 so chunks encode without padding.
+IMAGE_ENCODE_CHUNK_BYTES = 48 * 1024
+
+# SDK clients shared across OpenAIClient instances, keyed by (kind, api_key, base_url).
+# The wiki endpoints build a new OpenAIClient per request; sharing the underlying
+# SDK client keeps its httpx connection pool (and warm TLS sessions) alive.
+_SDK_CLIENTS: Dict[tuple, Union[OpenAI, AsyncOpenAI]] = {}
+
 
 # completion parsing functions and you can combine them into one singple chat completion parser
 def get_first_message_content(completion: ChatCompletion) -> str:
@@ -193,7 +203,11 @@ class OpenAIClient(ModelClient):
             raise ValueError(
                 f"Environment variable {self._env_api_key_name} must be set"
             )
-        return OpenAI(api_key=api_key, base_url=self.base_url)
+        key = ("sync", api_key, self.base_url)
+        client = _SDK_CLIENTS.get(key)
+        if client is None:
+            client = _SDK_CLIENTS[key] = OpenAI(api_key=api_key, base_url=self.base_url)
+        return client
 
     def init_async_client(self):
         api_key = self._api_key or os.getenv(self._env_api_key_name)
@@ -201,7 +215,11 @@ class OpenAIClient(ModelClient):
             raise ValueError(
                 f"Environment variable {self._env_api_key_name} must be set"
             )
-        return AsyncOpenAI(api_key=api_key, base_url=self.base_url)
+        key = ("async", api_key, self.base_url)
+        client = _SDK_CLIENTS.get(key)
+        if client is None:
+            client = _SDK_CLIENTS[key] = AsyncOpenAI(api_key=api_key, base_url=self.base_url)
+        return client
 
     # def _parse_chat_completion(self, completion: ChatCompletion) -> "GeneratorOutput":
     #     # TODO: raw output it is better to save the whole completion as a source of truth instead of just the message
@@ -242,10 +260,11 @@ class OpenAIClient(ModelClient):
     ) -> CompletionUsage:
 
         try:
+            completion_usage = completion.usage
             usage: CompletionUsage = CompletionUsage(
-                completion_tokens=completion.usage.completion_tokens,
-                prompt_tokens=completion.usage.prompt_tokens,
-                total_tokens=completion.usage.total_tokens,
+                completion_tokens=completion_usage.completion_tokens,
+                prompt_tokens=completion_usage.prompt_tokens,
+                total_tokens=completion_usage.total_tokens,
             )
             return usage
         except Exception as e:
@@ -431,7 +450,7 @@ class OpenAIClient(ModelClient):
                 stream_response = self.sync_client.chat.completions.create(**streaming_kwargs)
 
                 # Accumulate all content from the stream
-                accumulated_content = ""
+                content_parts = []
                 id = ""
                 model = ""
                 created = 0
@@ -444,8 +463,8 @@ class OpenAIClient(ModelClient):
                         delta = getattr(choices[0], "delta", None)
                         if delta is not None:
                             text = getattr(delta, "content", None)
-                            if text is not None:
-                                accumulated_content += text or ""
+                            if text:
+                                content_parts.append(text)
                 # Return the mock completion object that will be processed by the chat_completion_parser
                 return ChatCompletion(
                     id = id,
@@ -455,7 +474,7 @@ class OpenAIClient(ModelClient):
                     choices=[Choice(
                         index=0,
                         finish_reason="stop",
-                        message=ChatCompletionMessage(content=accumulated_content, role="assistant")
+                        message=ChatCompletionMessage(content="".join(content_parts), role="assistant")
                     )]
                 )
         elif model_type == ModelType.IMAGE_GENERATION:
@@ -545,11 +564,23 @@ class OpenAIClient(ModelClient):
             Base64 encoded image string.
 
         Raises:
-            ValueError: If the file cannot be read or doesn't exist.
+            ValueError: If the file cannot be read, doesn't exist, or is too large.
         """
         try:
+            size = os.path.getsize(image_path)
+            if size > MAX_IMAGE_BYTES:
+                raise ValueError(
+                    f"Image file too large ({size} bytes, max {MAX_IMAGE_BYTES}): {image_path}"
+                )
+            # Encode chunk by chunk so the raw file is never held in memory alongside
+            # the 4/3-size encoded copy.
+            encoded = bytearray()
             with open(image_path, "rb") as image_file:
-                return base64.b64encode(image_file.read()).decode("utf-8")
+                while chunk := image_file.read(IMAGE_ENCODE_CHUNK_BYTES):
+                    encoded += binascii.b2a_base64(chunk, newline=False)
+            return encoded.decode("ascii")
+        except ValueError:
+            raise
         except FileNotFoundError:
             raise ValueError(f"Image file not found: {image_path}")
         except PermissionError: